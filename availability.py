@@ -0,0 +1,144 @@
+# availability.py
+#
+# Precomputed availability index used by the solver. Each store and each
+# "AM SUN"-style hour key maps to an integer bitmask over roster positions,
+# so finding the candidates for a slot is a single bitwise AND.
+
+from profiling import profiled
+
+
+def hour_key(day, shift):
+    """Return the availability key used in employee records, e.g. "AM SUN"."""
+    return f"{shift} {day[:3].upper()}"
+
+
+def iter_bits(mask):
+    """Yield the positions of the set bits in mask, lowest first."""
+    bits = bin(mask)[:1:-1]  # Little-endian bit string without the "0b" prefix
+    i = bits.find("1")
+    while i != -1:
+        yield i
+        i = bits.find("1", i + 1)
+
+
+def collab_of(record):
+    """Return the name of the record's chosen collaborator, or None if it has none."""
+    partner = record.get("collab")
+    return None if partner in (None, "", "None", "No Collab") else partner
+
+
+def mask_from_positions(positions, size):
+    """Build an integer bitmask with the given positions set."""
+    buf = bytearray((size + 7) // 8)
+    for i in positions:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+class AvailabilityIndex:
+    """Bitmask index of which employees can work each store and hour key."""
+
+    @profiled("build_index")
+    def __init__(self, employees):
+        self.employees = list(employees)
+        self.positions = {emp["name"]: i for i, emp in enumerate(self.employees)}
+        self.all_mask = (1 << len(self.employees)) - 1
+
+        store_positions = {}
+        hour_positions = {}
+        for i, emp in enumerate(self.employees):
+            for store in emp["stores"]:
+                store_positions.setdefault(store, []).append(i)
+            for hour in emp["hours"]:
+                hour_positions.setdefault(hour, []).append(i)
+
+        size = len(self.employees)
+        self.store_masks = {store: mask_from_positions(p, size) for store, p in store_positions.items()}
+        self.hour_masks = {hour: mask_from_positions(p, size) for hour, p in hour_positions.items()}
+        self._collab = None
+
+    @classmethod
+    def from_masks(cls, employees, store_masks, hour_masks):
+        """Build an index from precomputed masks (e.g. a roster snapshot) without scanning records."""
+        index = cls.__new__(cls)
+        index.employees = list(employees)
+        index.positions = {emp["name"]: i for i, emp in enumerate(index.employees)}
+        index.all_mask = (1 << len(index.employees)) - 1
+        index.store_masks = dict(store_masks)
+        index.hour_masks = dict(hour_masks)
+        index._collab = None
+        return index
+
+    def __len__(self):
+        return len(self.employees)
+
+    def copy(self):
+        """Return an index that update() can change without touching this one."""
+        return AvailabilityIndex.from_masks(self.employees, self.store_masks, self.hour_masks)
+
+    @property
+    def collab(self):
+        """CollabIndex over the indexed employees, built on first use."""
+        if self._collab is None:
+            self._collab = CollabIndex(self.employees)
+        return self._collab
+
+    def slot_mask(self, day, shift, store):
+        """Return the mask of employees who can work the given slot."""
+        return self.store_masks.get(store, 0) & self.hour_masks.get(hour_key(day, shift), 0)
+
+    def mask_for(self, employees):
+        """Return the mask covering the given employee records (matched by name)."""
+        positions = (self.positions.get(emp["name"]) for emp in employees)
+        return mask_from_positions([i for i in positions if i is not None], len(self.employees))
+
+    def shift_caps(self, default):
+        """Return each position's weekly shift limit: the record's "max_shifts" or default."""
+        return [emp.get("max_shifts") or default for emp in self.employees]
+
+    def update(self, old_name, record):
+        """Re-point one employee's bits at a changed record, keeping its position."""
+        i = self.positions.pop(old_name)
+        bit = 1 << i
+        old = self.employees[i]
+        for store in old["stores"]:
+            self.store_masks[store] &= ~bit
+        for hour in old["hours"]:
+            self.hour_masks[hour] &= ~bit
+        for store in record["stores"]:
+            self.store_masks[store] = self.store_masks.get(store, 0) | bit
+        for hour in record["hours"]:
+            self.hour_masks[hour] = self.hour_masks.get(hour, 0) | bit
+        self.employees[i] = record
+        self.positions[record["name"]] = i
+        self._collab = None
+        return i
+
+    def members(self, mask):
+        """Return the employee records in mask, in roster order."""
+        return [self.employees[i] for i in iter_bits(mask)]
+
+
+class CollabIndex:
+    """Collaborator adjacency: who each employee chose and who chose them.
+
+    Built once per roster so checking a pairing preference during scoring
+    is a dict lookup instead of a scan over the records.
+    """
+
+    def __init__(self, employees):
+        self.partners = {}   # name -> chosen collaborator
+        self.chosen_by = {}  # name -> names of the employees who chose them
+        for emp in employees:
+            partner = collab_of(emp)
+            if partner is not None:
+                self.partners[emp["name"]] = partner
+                self.chosen_by.setdefault(partner, []).append(emp["name"])
+
+    def __len__(self):
+        return len(self.partners)
+
+    def paired(self, name, working):
+        """True if name's collaborator is in working (a set of names on the same shift)."""
+        partner = self.partners.get(name)
+        return partner is not None and partner in working
\ No newline at end of file
@@ -0,0 +1,151 @@
+# benchmark.py
+#
+# Times the scheduling hot path on synthetic rosters and prints the results
+# as JSON with percentiles, so runs can be compared over time:
+#
+#   python benchmark.py --employees 100 1000 10000 --repeat 5 --out bench.json
+#
+# Runs headlessly: rendering is timed through schedule_render, and nothing
+# opens a window.
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from constants import DAYS, SHIFTS, STORES
+from synthetic_roster import store_names, write_roster
+from solver import Constraints, MODES, solve
+from schedule_render import render_schedule
+import roster as roster_module
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples):
+    """Return min/mean/p50/p90/p99/max in milliseconds for a list of seconds."""
+    values = sorted(samples)
+    return {
+        "repeat": len(values),
+        "min_ms": values[0] * 1000,
+        "mean_ms": sum(values) / len(values) * 1000,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p90_ms": percentile(values, 0.90) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": values[-1] * 1000,
+    }
+
+
+def measure(repeat, func, setup=None):
+    """Call func repeat times (after setup, untimed) and return the timings in seconds."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_roster(size, stores, args):
+    """Yield (case, samples) for one roster size."""
+    # utils imports tkinter.messagebox, which needs no display until a dialog is shown
+    from utils import is_duplicate_name, write_employees
+
+    write_roster(roster_module.EMPLOYEE_FILE, size, stores, args.density, args.seed)
+    cache = roster_module._get_cache()
+
+    yield "read_roster_cold", measure(args.repeat, roster_module.get_roster, cache.invalidate)
+    yield "read_roster_warm", measure(args.repeat, roster_module.get_roster)
+
+    roster = roster_module.get_roster()
+    employees = list(roster.employees)
+    yield "write_employees", measure(args.repeat, lambda: write_employees(employees))
+
+    probes = [employees[i * size // 100]["name"].upper() for i in range(100)] + ["Nobody Here"] * 100
+    roster_module.get_roster()  # Reload after the writes so only the lookups are timed
+    yield "is_duplicate_name_x200", measure(args.repeat, lambda: [is_duplicate_name(name) for name in probes])
+
+    index = roster.index
+    for mode in args.modes:
+        constraints = Constraints(mode=mode, seed=args.seed, time_budget=args.time_budget)
+        yield f"solve_{mode}", measure(
+            args.repeat, lambda: solve(employees, stores, DAYS, SHIFTS, constraints, index=index)
+        )
+
+    schedule = solve(employees, stores, DAYS, SHIFTS, Constraints(seed=args.seed), index=index)
+    yield "render", measure(args.repeat, lambda: render_schedule(schedule, stores, DAYS, SHIFTS))
+
+
+def run(args):
+    stores = store_names(args.stores)
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        # The roster module reads employee.json from the working directory
+        previous = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for size in args.employees:
+                for case, samples in bench_roster(size, stores, args):
+                    result = {"case": case, "employees": size}
+                    result.update(summarize(samples))
+                    results.append(result)
+                    print(f"{case:<24} {size:>7} employees  p50 {result['p50_ms']:9.2f} ms", file=sys.stderr)
+        finally:
+            os.chdir(previous)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "stores": len(stores),
+            "density": args.density,
+            "seed": args.seed,
+            "modes": args.modes,
+            "time_budget": args.time_budget,
+        },
+        "results": results,
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark roster I/O, solving and rendering.")
+    parser.add_argument("--employees", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Roster sizes to benchmark (default: %(default)s)")
+    parser.add_argument("--stores", type=int, default=len(STORES), help="Number of stores (default: %(default)s)")
+    parser.add_argument("--density", type=float, default=0.4,
+                        help="Chance an employee works a given store or hour (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (default: %(default)s)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES),
+                        help="Solver modes to time (default: all)")
+    parser.add_argument("--time-budget", type=float, help="Seconds the optimal mode may spend per solve")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the roster and solver (default: %(default)s)")
+    parser.add_argument("--out", help="Write the JSON report here instead of stdout")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.repeat < 1:
+        raise SystemExit("--repeat must be at least 1")
+    if roster_module.EMPLOYEE_DB:
+        raise SystemExit("Unset SCHEDULE_GEN_DB: the benchmark times the employee.json file path")
+    report = run(args)
+    if args.out:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,261 @@
+# cli.py
+#
+# Command-line entry point for generating schedules without the GUI:
+#
+#   python cli.py generate --weeks 12 --stores "LEHI,MURRAY" --stores SANDY --out schedules
+#   python cli.py import new_hires.csv --rejects rejected.csv
+#   python cli.py check --stores LEHI --max-shifts 4
+#
+# Nothing imported here may pull in tkinter or customtkinter.
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from constants import STORES, DAYS, SHIFTS, EMPLOYEE_FILE, MAX_SHIFTS, SLOT_SIZE
+from roster import RosterCache
+from feasibility import check_feasibility
+from solver import Constraints, MODES, solve
+from parallel import merge, partition, submit_jobs
+from multistart import solve_best_of
+from schedule_export import FORMATS, next_week_start, open_exporter
+from schedule_cache import ScheduleCache, solve_cached
+import profiling
+from roster_import import import_file
+
+
+def load_selection(path, roster):
+    """Return the selected employee records.
+
+    ``path`` may be the GUI's employee_selection.json ({name: bool}) or a text
+    file with one name per line. Without a path every employee is selected.
+    """
+    if path is None:
+        return list(roster.employees)
+    with open(path, "r") as file:
+        text = file.read()
+    try:
+        state = json.loads(text)
+    except ValueError:
+        state = None
+    if isinstance(state, dict):
+        # Names missing from the saved state default to selected, as in the GUI
+        return [emp for emp in roster.employees if state.get(emp["name"], True)]
+    names = {line.strip() for line in text.splitlines() if line.strip()}
+    return [emp for emp in roster.employees if emp["name"] in names]
+
+
+def parse_store_groups(values):
+    """Turn repeated --stores "A,B" options into a list of store lists."""
+    if not values:
+        return [list(STORES)]
+    groups = []
+    for value in values:
+        group = [store.strip() for store in value.split(",") if store.strip()]
+        unknown = [store for store in group if store not in STORES]
+        if unknown:
+            raise SystemExit(f"Unknown store(s): {', '.join(unknown)}")
+        groups.append(group)
+    return groups
+
+
+def group_label(group):
+    return "all" if group == list(STORES) else "-".join(store.lower().replace(" ", "_") for store in group)
+
+
+def generate(args):
+    roster = RosterCache(args.roster).get()
+    if not roster.employees:
+        raise SystemExit(f"No employees found in {args.roster}")
+    employees = load_selection(args.selection, roster)
+    groups = parse_store_groups(args.stores)
+    os.makedirs(args.out, exist_ok=True)
+
+    # Pick a base seed when none was given so every week can be reproduced
+    base_seed = random.randrange(2 ** 32) if args.seed is None else args.seed
+    runs = []
+    for week in range(1, args.weeks + 1):
+        constraints = Constraints(
+            slot_size=args.slot_size, max_shifts=args.max_shifts, seed=base_seed + week - 1,
+            mode=args.mode, time_budget=args.time_budget
+        )
+        for group in groups:
+            runs.append((week, group, constraints))
+
+    # Warn about gaps before solving; only the seed changes between weeks
+    for group in groups:
+        report = check_feasibility(employees, group, DAYS, SHIFTS, runs[0][2], index=roster.index)
+        if not report.feasible:
+            print(f"{group_label(group)}: {report.summary()} (cli.py check lists them)", file=sys.stderr)
+        if args.starts > 1 and args.target_score is not None and args.target_score > report.max_score:
+            print(f"{group_label(group)}: target score {args.target_score:g} is out of reach, "
+                  f"stopping at {report.max_score:.1f}", file=sys.stderr)
+
+    exporters = open_exporters(args, groups)
+    try:
+        solve_runs(args, roster, employees, runs, exporters)
+    finally:
+        for exporter in exporters.values():
+            exporter.close()
+
+
+def open_exporters(args, groups):
+    """Open one streaming exporter per (--export format, store group)."""
+    exporters = {}
+    for fmt in args.export or []:
+        for group in groups:
+            label = group_label(group)
+            target = f"ics-{label}" if fmt == "ics" else f"schedule-{label}.{fmt}"
+            exporters[fmt, label] = open_exporter(fmt, os.path.join(args.out, target))
+    return exporters
+
+
+def solve_runs(args, roster, employees, runs, exporters):
+    def finish(week, group, constraints, schedule):
+        write_schedule(args, week, group, constraints, schedule)
+        week_start = args.start_date + datetime.timedelta(weeks=week - 1)
+        for fmt in args.export or []:
+            exporters[fmt, group_label(group)].write_week(week_start, schedule)
+
+    if args.starts > 1:
+        for week, group, constraints in runs:
+            schedule = solve_best_of(employees, group, DAYS, SHIFTS, constraints, starts=args.starts,
+                                     workers=args.workers, target_score=args.target_score, index=roster.index)
+            finish(week, group, constraints, schedule)
+    elif args.workers:
+        # Every week and every independent store component becomes its own job
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            pending = []
+            for week, group, constraints in runs:
+                pending.append(submit_jobs(executor, partition(employees, group), DAYS, SHIFTS, constraints))
+            for (week, group, constraints), futures in zip(runs, pending):
+                parts = [future.result() for future in futures]
+                schedule = merge(parts, employees, group, DAYS, SHIFTS, constraints)
+                finish(week, group, constraints, schedule)
+    elif args.cache:
+        cache = ScheduleCache(args.cache)
+        for week, group, constraints in runs:
+            schedule, _ = solve_cached(cache, roster, employees, group, DAYS, SHIFTS, constraints, index=roster.index)
+            finish(week, group, constraints, schedule)
+    else:
+        for week, group, constraints in runs:
+            schedule = solve(employees, group, DAYS, SHIFTS, constraints, index=roster.index)
+            finish(week, group, constraints, schedule)
+
+
+def write_schedule(args, week, group, constraints, schedule):
+    path = os.path.join(args.out, f"week-{week:02d}-{group_label(group)}.json")
+    with open(path, "w") as file:
+        json.dump({
+            "week": week,
+            "stores": group,
+            "mode": constraints.mode,
+            "seed": schedule.seed,
+            "stats": schedule.stats,
+            "schedule": schedule.as_dict(),
+        }, file, indent=2)
+    print(f"{path}: coverage {schedule.stats['coverage']:.0%}, score {schedule.stats['score']:.1f}")
+
+
+def check(args):
+    """Print what limits each store group's coverage; exit status 1 if any group has gaps."""
+    roster = RosterCache(args.roster).get()
+    employees = load_selection(args.selection, roster)
+    constraints = Constraints(slot_size=args.slot_size, max_shifts=args.max_shifts, mode=args.mode)
+    status = 0
+    for group in parse_store_groups(args.stores):
+        report = check_feasibility(employees, group, DAYS, SHIFTS, constraints, index=roster.index)
+        print(f"{group_label(group)}: " + "\n".join(report.lines(args.show)))
+        if not report.feasible:
+            status = 1
+    return status
+
+
+def import_roster(args):
+    report = import_file(args.file, args.format, dry_run=args.dry_run)
+    for row_number, name, reason in report.rejected[:args.show]:
+        print(f"row {row_number}: {name or '?'}: {reason}", file=sys.stderr)
+    if len(report.rejected) > args.show:
+        print(f"... {len(report.rejected) - args.show} more rejected rows", file=sys.stderr)
+    if args.rejects:
+        report.write_rejections(args.rejects)
+    print(report.summary())
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Employee schedule generator (headless).")
+    parser.add_argument("--profile", nargs="?", const="timers", metavar="FEATURES",
+                        help="Record per-phase timings; FEATURES is a comma separated list of "
+                             f"{', '.join(profiling.FEATURES)} (default: timers)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="Generate schedules for one or more weeks and store groups.")
+    gen.add_argument("--roster", default=EMPLOYEE_FILE, help="JSON Lines employee file (default: %(default)s)")
+    gen.add_argument("--selection", help="employee_selection.json or a file with one name per line")
+    gen.add_argument("--weeks", type=int, default=1, help="Number of weeks to generate (default: %(default)s)")
+    gen.add_argument("--stores", action="append", metavar="STORE[,STORE...]",
+                     help="Store group to schedule together; repeat for several groups (default: all stores)")
+    gen.add_argument("--out", default="schedules", help="Output directory (default: %(default)s)")
+    gen.add_argument("--mode", choices=MODES, default="random", help="Solver mode (default: %(default)s)")
+    gen.add_argument("--seed", type=int, help="Seed for week 1; later weeks use seed + week - 1")
+    gen.add_argument("--time-budget", type=float, help="Seconds the optimal mode may spend per schedule")
+    gen.add_argument("--workers", type=int,
+                     help="Solve weeks and independent store groups in this many processes")
+    gen.add_argument("--starts", type=int, default=1,
+                     help="Run this many seeded passes per schedule and keep the best (default: %(default)s)")
+    gen.add_argument("--target-score", type=float,
+                     help="With --starts, stop as soon as a pass reaches this score")
+    gen.add_argument("--slot-size", type=int, default=SLOT_SIZE,
+                     help="Employees per slot where no headcount rule applies (default: %(default)s)")
+    gen.add_argument("--max-shifts", type=int, default=MAX_SHIFTS,
+                     help="Shifts per employee per week unless their record sets max_shifts (default: %(default)s)")
+    gen.add_argument("--cache", metavar="DIR",
+                     help="Reuse schedules cached in DIR for unchanged inputs (not with --starts/--workers)")
+    gen.add_argument("--export", action="append", choices=FORMATS,
+                     help="Also export all weeks of each store group in this format; repeat for several")
+    gen.add_argument("--start-date", type=datetime.date.fromisoformat, default=next_week_start(),
+                     help="Date of the first week's Sunday, YYYY-MM-DD (default: the coming Sunday)")
+    gen.set_defaults(func=generate)
+
+    chk = commands.add_parser("check", help="Report slots and employees that limit coverage, without solving.")
+    chk.add_argument("--roster", default=EMPLOYEE_FILE, help="JSON Lines employee file (default: %(default)s)")
+    chk.add_argument("--selection", help="employee_selection.json or a file with one name per line")
+    chk.add_argument("--stores", action="append", metavar="STORE[,STORE...]",
+                     help="Store group to check; repeat for several groups (default: all stores)")
+    chk.add_argument("--mode", choices=MODES, default="random",
+                     help="Solver mode whose rules bound the coverage (default: %(default)s)")
+    chk.add_argument("--slot-size", type=int, default=SLOT_SIZE,
+                     help="Employees per slot where no headcount rule applies (default: %(default)s)")
+    chk.add_argument("--max-shifts", type=int, default=MAX_SHIFTS,
+                     help="Shifts per employee per week unless their record sets max_shifts (default: %(default)s)")
+    chk.add_argument("--show", type=int, default=20,
+                     help="Entries to print per kind of problem (default: %(default)s)")
+    chk.set_defaults(func=check)
+
+    imp = commands.add_parser("import", help="Add employees in bulk from a CSV or JSON Lines file.")
+    imp.add_argument("file", help="CSV file with a header row, or JSON Lines in the employee.json format")
+    imp.add_argument("--format", choices=("csv", "jsonl"), help="File format (default: from the extension)")
+    imp.add_argument("--dry-run", action="store_true", help="Validate only; do not add anyone")
+    imp.add_argument("--rejects", metavar="CSV", help="Write the rejected rows and reasons to this file")
+    imp.add_argument("--show", type=int, default=20,
+                     help="Rejected rows to print (default: %(default)s)")
+    imp.set_defaults(func=import_roster)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        profiling.enable(args.profile.split(","))
+    with profiling.run(args.command):
+        status = args.func(args)
+    if profiling.is_enabled():
+        print(profiling.summary(args.command), end="", file=sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
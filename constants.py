@@ -1,3 +1,73 @@
-STORES = ["LEHI", "SALT LAKE", "MURRAY", "SANDY", "SPANISH FORK"]
-DAYS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
-SHIFTS = ["AM", "PM"]
\ No newline at end of file
+import json
+import os
+
+# The store, day and shift catalog can be overridden by a JSON config file
+# (see schedule_config.example.json); any key it leaves out keeps the default.
+CONFIG_FILE = os.environ.get("SCHEDULE_GEN_CONFIG", "schedule_config.json")
+
+DEFAULT_CATALOG = {
+    "stores": ["LEHI", "SALT LAKE", "MURRAY", "SANDY", "SPANISH FORK"],
+    "days": ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"],
+    "shifts": ["AM", "PM"],
+    # Start and end time of each shift, used for calendar export
+    "shift_times": {"AM": ["08:00", "14:00"], "PM": ["14:00", "20:00"]},
+    # Row colors for shifts other than AM and PM in the schedule window
+    "shift_colors": {},
+    "slot_size": 3,   # Default employees wanted per (day, shift, store)
+    "max_shifts": 5,  # Default shifts per employee per week
+    # Per-slot headcount targets: "STORE/DAY/SHIFT" -> employees, "*" matches anything
+    "headcount": {},
+}
+MAX_HEADCOUNT = 255  # Largest per-slot target; slots.SlotTable stores targets as bytes
+
+
+def _check_count(path, what, value, low, high=None):
+    if isinstance(value, bool) or not isinstance(value, int) or value < low or (high is not None and value > high):
+        limits = f"of at least {low}" if high is None else f"from {low} to {high}"
+        raise ValueError(f"{path}: {what} must be a whole number {limits}, not {value!r}")
+
+
+def load_catalog(path=CONFIG_FILE):
+    """Return DEFAULT_CATALOG updated with the settings in path, if it exists."""
+    catalog = dict(DEFAULT_CATALOG)
+    try:
+        with open(path, "r") as file:
+            catalog.update(json.load(file))
+    except FileNotFoundError:
+        pass
+    for key in ("stores", "days", "shifts"):
+        if not catalog[key] or len(set(catalog[key])) != len(catalog[key]):
+            raise ValueError(f"{path}: '{key}' must be a non-empty list without duplicates")
+    if len({day[:3].upper() for day in catalog["days"]}) != len(catalog["days"]):
+        raise ValueError(f"{path}: day names must differ in their first three letters")
+    _check_count(path, "'slot_size'", catalog["slot_size"], 0, MAX_HEADCOUNT)
+    _check_count(path, "'max_shifts'", catalog["max_shifts"], 1)
+    if not isinstance(catalog["headcount"], dict):
+        raise ValueError(f"{path}: 'headcount' must map \"STORE/DAY/SHIFT\" to a number of employees")
+    for pattern, count in catalog["headcount"].items():
+        _check_count(path, f"headcount {pattern!r}", count, 0, MAX_HEADCOUNT)
+    return catalog
+
+
+CATALOG = load_catalog()
+STORES = CATALOG["stores"]
+DAYS = CATALOG["days"]
+SHIFTS = CATALOG["shifts"]
+SHIFT_TIMES = {shift: tuple(times) for shift, times in CATALOG["shift_times"].items()}
+SLOT_SIZE = CATALOG["slot_size"]
+MAX_SHIFTS = CATALOG["max_shifts"]
+HEADCOUNT = CATALOG["headcount"]
+
+EMPLOYEE_FILE = "employee.json"
+# Path of the SQLite employee store; when unset the JSON Lines file is used.
+EMPLOYEE_DB = os.environ.get("SCHEDULE_GEN_DB")
+# Saved checkbox state of the employee selection window, {name: bool}
+SELECTION_FILE = "employee_selection.json"
+
+# URL of a running schedule service (see service.py), e.g. "http://127.0.0.1:8765".
+# When set, the GUI reads and edits employees and generates schedules through it.
+SERVICE_URL = os.environ.get("SCHEDULE_GEN_SERVICE")
+SERVICE_PORT = 8765
+
+# Directory of cached generated schedules (see schedule_cache.py)
+SCHEDULE_CACHE_DIR = ".schedule_cache"
\ No newline at end of file
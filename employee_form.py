@@ -3,8 +3,10 @@ import tkinter as tk
 from tkinter import messagebox
 from collections import defaultdict
 import json
-from utils import read_employees, write_employees, is_duplicate_name, validate_name
+from utils import is_duplicate_name, validate_name
+from roster import add_employees, get_roster, update_employee as update_employee_record
 from constants import STORES, DAYS, SHIFTS
+from slots import SLOT_TABLE
 
 class EmployeeForm(ctk.CTkToplevel):
     def __init__(self, master, employee_data=None):
@@ -17,7 +19,8 @@ class EmployeeForm(ctk.CTkToplevel):
         # Configure grid layout
         self.grid_columnconfigure(0, weight=0)
         self.grid_columnconfigure((1, 2, 3, 4, 5, 6, 7), weight=1)
-        self.grid_rowconfigure((0, 1, 2, 3, 4, 5, 6), weight=0)
+        self.collab_row = 3 + len(SHIFTS)  # Rows below the hours grid move with the shift count
+        self.grid_rowconfigure(tuple(range(self.collab_row + 2)), weight=0)
 
         # Name Section
         self.nameLabel = ctk.CTkLabel(self, text="Name")
@@ -37,10 +40,10 @@ class EmployeeForm(ctk.CTkToplevel):
             self, text="Add Employee" if not employee_data else "Update Employee",
             command=self.generateResults if not employee_data else self.update_employee
         )
-        self.generateResultsButton.grid(row=6, column=1, columnspan=3, padx=20, pady=20, sticky="ew")
+        self.generateResultsButton.grid(row=self.collab_row + 1, column=1, columnspan=3, padx=20, pady=20, sticky="ew")
 
         self.clearButton = ctk.CTkButton(self, text="Clear Form", command=self.clear_form)
-        self.clearButton.grid(row=6, column=4, columnspan=3, padx=20, pady=20, sticky="ew")
+        self.clearButton.grid(row=self.collab_row + 1, column=4, columnspan=3, padx=20, pady=20, sticky="ew")
 
         if employee_data:
             self.load_existing_data(employee_data)
@@ -58,27 +61,32 @@ class EmployeeForm(ctk.CTkToplevel):
         """Create the hours selection section with checkboxes."""
         self.choiceLabel = ctk.CTkLabel(self, text="Available Hours")
         self.choiceLabel.grid(row=2, column=0, padx=20, pady=10, sticky="w")
-        self.hour_vars = {f"{period} {day[:3].upper()}": tk.BooleanVar(value=False) for day in DAYS for period in SHIFTS}
-        for i, day in enumerate(DAYS):
+        # Hour keys ("AM SUN") come precomputed from the shared slot table
+        self.hour_vars = {key: tk.BooleanVar(value=False) for keys in SLOT_TABLE.hour_keys for key in keys}
+        for i, (day, keys) in enumerate(zip(DAYS, SLOT_TABLE.hour_keys)):
             label = ctk.CTkLabel(self, text=day)
             label.grid(row=2, column=i + 1, pady=5, padx=(5, 2), sticky="w")
-            for j, period in enumerate(SHIFTS):
-                checkbox = ctk.CTkCheckBox(self, text=period, variable=self.hour_vars[f"{period} {day[:3].upper()}"])
+            for j, (period, key) in enumerate(zip(SHIFTS, keys)):
+                checkbox = ctk.CTkCheckBox(self, text=period, variable=self.hour_vars[key])
                 checkbox.grid(row=3 + j, column=i + 1, padx=2, pady=5, sticky="w")
 
     def create_collab_section(self):
         """Create the collaborator dropdown section."""
         self.collab = ctk.CTkLabel(self, text="Collaborate")
-        self.collab.grid(row=5, column=0, padx=20, pady=20, sticky="ew")
+        self.collab.grid(row=self.collab_row, column=0, padx=20, pady=20, sticky="ew")
         values = self.load_collab_values()
         self.collabDrop = ctk.CTkOptionMenu(self, values=values)
-        self.collabDrop.grid(row=5, column=1, padx=20, pady=20, columnspan=6, sticky="ew")
+        self.collabDrop.grid(row=self.collab_row, column=1, padx=20, pady=20, columnspan=4, sticky="ew")
+
+        # Optional per-employee weekly limit; blank uses the configured default
+        self.maxShiftsLabel = ctk.CTkLabel(self, text="Max Shifts")
+        self.maxShiftsLabel.grid(row=self.collab_row, column=5, padx=10, pady=20, sticky="e")
+        self.maxShiftsEntry = ctk.CTkEntry(self, placeholder_text="Default")
+        self.maxShiftsEntry.grid(row=self.collab_row, column=6, padx=10, pady=20, sticky="ew")
 
     def load_collab_values(self):
         """Load collaborator values from the employee file."""
-        employees = read_employees()
-        names = sorted([emp["name"] for emp in employees], key=lambda x: x.lower())
-        return ["None"] + names
+        return ["None"] + get_roster().sorted_names
 
     def load_existing_data(self, employee_data):
         """Load existing employee data into the form."""
@@ -92,6 +100,8 @@ class EmployeeForm(ctk.CTkToplevel):
                 if hour in emp["hours"]:
                     self.hour_vars[hour].set(True)
             self.collabDrop.set(emp["collab"] if emp["collab"] != "No Collab" else "None")
+            if emp.get("max_shifts"):
+                self.maxShiftsEntry.insert(0, str(emp["max_shifts"]))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load existing data: {e}")
 
@@ -99,13 +109,13 @@ class EmployeeForm(ctk.CTkToplevel):
         """Validate inputs and save the employee data."""
         if not self.validate_inputs():
             return
-        text = self.createText()
-        if text != "No name was entered":
+        record = self.createRecord()
+        if record is not None:
             try:
-                if is_duplicate_name(self.nameEntry.get().strip()):
+                if is_duplicate_name(record["name"]):
                     messagebox.showwarning("Error", "Employee name already exists (case-insensitive)!")
                     return
-                self.save_employee(text)
+                self.save_employee(record)
                 messagebox.showinfo("Success", "Employee added successfully!")
                 self.destroy()
             except Exception as e:
@@ -126,30 +136,37 @@ class EmployeeForm(ctk.CTkToplevel):
         if not any(var.get() for var in self.hour_vars.values()):
             messagebox.showwarning("Error", "At least one hour must be selected.")
             return False
+        max_shifts = self.maxShiftsEntry.get().strip()
+        if max_shifts and (not max_shifts.isdecimal() or int(max_shifts) < 1):
+            messagebox.showwarning("Error", "Max shifts must be a whole number of at least 1.")
+            return False
         return True
 
-    def createText(self):
-        """Generate a JSON string from the form data."""
+    def createRecord(self):
+        """Return the form data as an employee record, or None if no name was entered."""
         name = self.nameEntry.get().strip()
         if not name:
-            return "No name was entered"
+            return None
 
         store = [s for s, var in self.store_vars.items() if var.get()] or ["No store selected"]
         hours = [h for h, var in self.hour_vars.items() if var.get()] or ["No hours selected"]
         collab = self.collabDrop.get() if self.collabDrop.get() != "None" else "No Collab"
 
-        return json.dumps({
+        record = {
             "name": name,
             "stores": store,
             "hours": hours,
             "collab": collab
-        })
-
-    def save_employee(self, text):
-        """Save employee data to the file."""
+        }
+        max_shifts = self.maxShiftsEntry.get().strip()
+        if max_shifts.isdecimal():
+            record["max_shifts"] = int(max_shifts)
+        return record
+
+    def save_employee(self, record):
+        """Save a new employee record (one fsynced append to the change log)."""
         try:
-            with open("employee.json", "a") as file:
-                file.write(text + "\n")
+            add_employees([record])
         except Exception as e:
             raise Exception(f"Failed to write to file: {e}")
 
@@ -157,22 +174,25 @@ class EmployeeForm(ctk.CTkToplevel):
         """Update existing employee data."""
         if not self.validate_inputs():
             return
-        updated_text = self.createText()
-        if updated_text != "No name was entered":
+        new_record = self.createRecord()
+        if new_record is not None:
             try:
-                self.replace_employee(self.original_data, updated_text)
-                messagebox.showinfo("Success", "Employee updated successfully!")
-                self.destroy()
+                old_record = json.loads(self.original_data)
+                self.replace_employee(old_record, new_record)
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to update employee: {e}")
+                return
+            messagebox.showinfo("Success", "Employee updated successfully!")
+            self.destroy()
+            # The record is saved; patching an open schedule is separate from the save
+            if hasattr(self.master, "employee_updated"):
+                self.master.employee_updated(old_record, new_record)
         else:
             messagebox.showwarning("Error", "No name was entered")
 
-    def replace_employee(self, old_data, new_data):
-        """Replace old employee data with new data in the file."""
-        employees = read_employees()
-        updated_employees = [new_data if json.dumps(emp) == old_data else json.dumps(emp) for emp in employees]
-        write_employees(updated_employees)
+    def replace_employee(self, old_record, new_record):
+        """Replace an employee's record, found by its stable id."""
+        update_employee_record(old_record, new_record)
 
     def clear_form(self):
         """Clear all form fields."""
@@ -181,4 +201,5 @@ class EmployeeForm(ctk.CTkToplevel):
             var.set(False)
         for var in self.hour_vars.values():
             var.set(False)
-        self.collabDrop.set("None")
\ No newline at end of file
+        self.collabDrop.set("None")
+        self.maxShiftsEntry.delete(0, "end")
\ No newline at end of file
@@ -3,7 +3,8 @@ import tkinter as tk
 from tkinter import messagebox
 import json
 from employee_form import EmployeeForm
-from utils import read_employees
+from roster import get_roster, iter_employees
+from virtual_list import ChunkedLoader
 
 class EmployeeList(ctk.CTkToplevel):
     def __init__(self, master):
@@ -25,20 +26,25 @@ class EmployeeList(ctk.CTkToplevel):
         self.editButton.pack(pady=10)
 
     def load_employees(self):
-        """Load employees from the file."""
-        employees = read_employees()
-        if not employees:
+        """Load employees from the file, streaming names in chunks so the window opens at once."""
+        employees = iter_employees()
+        first = next(employees, None)
+        if first is None:
             raise Exception("No employees found in the file.")
-        for emp in employees:
-            self.listbox.insert(tk.END, emp["name"])
+        self.listbox.insert(tk.END, first["name"])
+        self.loader = ChunkedLoader(self, (emp["name"] for emp in employees), self.add_names)
+
+    def add_names(self, names):
+        """Append a chunk of employee names to the listbox."""
+        self.listbox.insert(tk.END, *names)
 
     def open_edit_form(self):
         """Open the edit form for the selected employee."""
         selected_index = self.listbox.curselection()
         if selected_index:
             try:
-                employees = read_employees()
-                EmployeeForm(self.master, json.dumps(employees[selected_index[0]]))
+                employee = get_roster().by_name[self.listbox.get(selected_index[0])]
+                EmployeeForm(self.master, json.dumps(employee))
                 self.destroy()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to open edit form: {e}")
\ No newline at end of file
@@ -0,0 +1,328 @@
+# employee_log.py
+#
+# Crash-safe editing of the JSON Lines employee file. The file itself is a
+# snapshot; every add, update and delete since then is appended as one line
+# to "<file>.log" and fsynced, so an edit costs one small write instead of a
+# whole-roster rewrite. Once the log grows past COMPACT_AFTER operations it
+# is folded into a new snapshot that replaces the old one by atomic rename.
+#
+# Log operations are numbered with an increasing "seq", and a compacted
+# snapshot starts with a header line {"seq": ..., "next_id": ...} naming the
+# last operation folded into it. Replay skips operations at or below that
+# number, so a log left behind by a crash mid-compaction is never applied a
+# second time, and ids of deleted employees are never handed out again.
+#
+# Every record carries a stable integer "id". Snapshots written before ids
+# existed get them assigned in file order by _iter_snapshot(), the same way
+# for every reader, until the next compaction stores them.
+
+import json
+import os
+from roster import normalize_name
+
+COMPACT_AFTER = 1000  # Log operations before folding the log into the snapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def log_path_for(path):
+    return path + ".log"
+
+
+def _iter_snapshot(path):
+    """Yield the snapshot header ({} if it has none), then its records.
+
+    Records without an id are given the next free one.
+    """
+    try:
+        file = open(path, "r")
+    except FileNotFoundError:
+        yield {}
+        return
+    with file:
+        header = None
+        next_id = 1
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if header is None:
+                header = {} if "name" in record else record
+                yield header
+                if header:
+                    continue
+            if "id" not in record:
+                record["id"] = next_id
+            next_id = max(next_id, record["id"] + 1)
+            yield record
+    if header is None:
+        yield {}
+
+
+def _is_newer(op, snapshot_seq):
+    """True if op was logged after the snapshot folding in operations up to snapshot_seq."""
+    return snapshot_seq is None or op.get("seq", 0) > snapshot_seq
+
+
+def _parse_log(data):
+    """Return (ops, consumed bytes) for the complete lines in data; a torn last line is left."""
+    ops = []
+    end = data.rfind(b"\n") + 1
+    for line in data[:end].splitlines():
+        try:
+            ops.append(json.loads(line))
+        except ValueError:
+            continue  # Damaged line from an interrupted write; skip it
+    return ops, end
+
+
+def _read_log(log_path, offset=0):
+    try:
+        with open(log_path, "rb") as file:
+            file.seek(offset)
+            data = file.read()
+    except FileNotFoundError:
+        return [], 0
+    return _parse_log(data)
+
+
+def iter_records(path):
+    """Yield the current roster (snapshot plus log) in roster order, streaming the snapshot."""
+    # The log is read first: if a compaction swaps the snapshot in between,
+    # the new snapshot's seq covers every operation read here.
+    ops = _read_log(log_path_for(path))[0]
+    records = _iter_snapshot(path)
+    snapshot_seq = next(records).get("seq")
+    latest = {}  # Employee id -> last logged record, or None if deleted
+    for op in ops:
+        if _is_newer(op, snapshot_seq):
+            latest[op["id"]] = op.get("record") if op["op"] != "delete" else None
+    for record in records:
+        if record["id"] in latest:
+            record = latest.pop(record["id"])
+            if record is None:
+                continue
+        yield record
+    # Whatever is left was added after the snapshot, in the order it was logged
+    for record in latest.values():
+        if record is not None:
+            yield record
+
+
+class EmployeeLog:
+    """Writer for a snapshot + append-only log employee file."""
+
+    def __init__(self, path, compact_after=COMPACT_AFTER):
+        self.path = path
+        self.log_path = log_path_for(path)
+        self.lock_path = path + ".lock"
+        self.compact_after = compact_after
+        self.records = None        # Employee id -> record, in roster order
+        self.name_ids = {}         # Normalized name -> employee id
+        self.next_id = 1
+        self.seq = 0               # Last log operation applied
+        self._snapshot_seq = None  # Last operation folded into the snapshot; None for old snapshots
+        self._snapshot_key = None  # stat of the snapshot the state was loaded from
+        self._log_offset = 0       # Bytes of the log already applied
+        self._log_ops = 0          # Operations in the log since the last compaction
+
+    # -- locking -----------------------------------------------------------
+
+    def _lock(self):
+        file = open(self.lock_path, "a+")
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        return file
+
+    def _unlock(self, file):
+        if fcntl is not None:
+            fcntl.flock(file, fcntl.LOCK_UN)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        file.close()
+
+    # -- reading -----------------------------------------------------------
+
+    def _stat_key(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _sync(self):
+        """Bring the in-memory state up to date; only new log lines are read when possible."""
+        key = self._stat_key()
+        if self.records is None or key != self._snapshot_key:
+            records = _iter_snapshot(self.path)
+            header = next(records)
+            self.records, self.name_ids = {}, {}
+            self.next_id = header.get("next_id", 1)
+            self._snapshot_seq = header.get("seq")
+            self.seq = self._snapshot_seq or 0
+            for record in records:
+                self._apply({"op": "add", "id": record["id"], "record": record})
+            self._snapshot_key = key
+            self._log_offset = self._log_ops = 0
+        ops, consumed = _read_log(self.log_path, self._log_offset)
+        for op in ops:
+            if _is_newer(op, self._snapshot_seq):
+                self._apply(op)
+        self._log_offset += consumed
+        self._log_ops += len(ops)
+
+    def _apply(self, op):
+        employee_id = op["id"]
+        old = self.records.pop(employee_id, None) if op["op"] == "delete" else self.records.get(employee_id)
+        if old is not None:
+            self.name_ids.pop(normalize_name(old["name"]), None)
+        if op["op"] != "delete":
+            self.records[employee_id] = op["record"]
+            self.name_ids[normalize_name(op["record"]["name"])] = employee_id
+        self.next_id = max(self.next_id, employee_id + 1)
+        self.seq = max(self.seq, op.get("seq", 0))
+
+    def load(self):
+        """Return the current records in roster order."""
+        lock = self._lock()
+        try:
+            self._sync()
+            return list(self.records.values())
+        finally:
+            self._unlock(lock)
+
+    # -- writing -----------------------------------------------------------
+
+    def _check_name(self, record, employee_id=None):
+        owner = self.name_ids.get(normalize_name(record["name"]))
+        if owner is not None and owner != employee_id:
+            raise ValueError("Employee name already exists (case-insensitive)!")
+
+    def _append(self, ops):
+        """Append ops to the log and fsync it; the caller holds the lock and has synced."""
+        for op in ops:
+            op["seq"] = self.seq = self.seq + 1
+        with open(self.log_path, "ab") as file:
+            # Drop a torn line left by a writer that crashed mid-append
+            if file.tell() > self._log_offset:
+                file.truncate(self._log_offset)
+            file.seek(self._log_offset)
+            file.write(b"".join(json.dumps(op).encode("utf-8") + b"\n" for op in ops))
+            file.flush()
+            os.fsync(file.fileno())
+            self._log_offset = file.tell()
+        for op in ops:
+            self._apply(op)
+        self._log_ops += len(ops)
+        if self._log_ops >= self.compact_after:
+            self._compact()
+
+    def _write(self, build_ops):
+        lock = self._lock()
+        try:
+            self._sync()
+            ops = build_ops()
+            if ops:
+                self._append(ops)
+            return ops
+        finally:
+            self._unlock(lock)
+
+    def add(self, record):
+        """Add one employee and return its id; raise ValueError if the name is taken."""
+        return self.add_many([record])[0]
+
+    def add_many(self, records):
+        """Add many employees with a single fsync; return their ids."""
+        def build():
+            ops, names = [], set()
+            for record in records:
+                self._check_name(record)
+                key = normalize_name(record["name"])
+                if key in names:
+                    raise ValueError("Employee name already exists (case-insensitive)!")
+                names.add(key)
+                employee_id = self.next_id + len(ops)
+                ops.append({"op": "add", "id": employee_id, "record": dict(record, id=employee_id)})
+            return ops
+        return [op["id"] for op in self._write(build)]
+
+    def update(self, employee_id, record):
+        """Replace the record with the given id."""
+        def build():
+            if employee_id not in self.records:
+                raise KeyError(f"No employee with id {employee_id}")
+            self._check_name(record, employee_id)
+            return [{"op": "update", "id": employee_id, "record": dict(record, id=employee_id)}]
+        self._write(build)
+
+    def delete(self, employee_id):
+        """Remove the employee with the given id."""
+        def build():
+            if employee_id not in self.records:
+                raise KeyError(f"No employee with id {employee_id}")
+            return [{"op": "delete", "id": employee_id}]
+        self._write(build)
+
+    def id_for_name(self, name):
+        """Return the id of the employee called name (case-insensitive), or None."""
+        lock = self._lock()
+        try:
+            self._sync()
+            return self.name_ids.get(normalize_name(name))
+        finally:
+            self._unlock(lock)
+
+    def replace_all(self, records):
+        """Replace the whole roster with a new snapshot; records keep their ids where given."""
+        lock = self._lock()
+        try:
+            self._sync()
+            self.records, self.name_ids = {}, {}
+            for record in records:
+                employee_id = record.get("id") or self.next_id
+                self._apply({"op": "add", "id": employee_id, "record": dict(record, id=employee_id)})
+            self._compact()
+        finally:
+            self._unlock(lock)
+
+    def compact(self):
+        """Fold the log into a new snapshot now."""
+        lock = self._lock()
+        try:
+            self._sync()
+            self._compact()
+        finally:
+            self._unlock(lock)
+
+    def _compact(self):
+        # Write the new snapshot beside the old one, make it durable, then swap
+        # it in atomically. Its header holds the seq of the last operation it
+        # includes, so if a crash leaves the old log behind, replay skips it.
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as file:
+            file.write(json.dumps({"seq": self.seq, "next_id": self.next_id}) + "\n")
+            for record in self.records.values():
+                file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+        if fcntl is not None:
+            directory = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+        with open(self.log_path, "wb") as file:
+            os.fsync(file.fileno())
+        self._snapshot_key = self._stat_key()
+        self._snapshot_seq = self.seq
+        self._log_offset = self._log_ops = 0
\ No newline at end of file
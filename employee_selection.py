@@ -4,7 +4,9 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
 import json
-from utils import read_employees
+from constants import SELECTION_FILE, SERVICE_URL
+from roster import get_employee_store, iter_employees
+from virtual_list import VirtualList, ChunkedLoader
 import platform  # To handle platform-specific mouse wheel behavior
 
 class EmployeeSelection(ctk.CTkToplevel):
@@ -14,51 +16,32 @@ class EmployeeSelection(ctk.CTkToplevel):
         self.geometry("500x600")
         self.callback = callback
 
-        # Load employees and their selection state
-        self.employees = read_employees()
+        # Selection state is kept per name; employees stream in after the window opens
         self.selection_state = self.load_selection_state()
+        self.names = []
+        self.selected = {}
 
         # Create a main frame to hold everything
         self.main_frame = ctk.CTkFrame(self)
         self.main_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
-        # Create a canvas and a scrollbar
-        self.canvas = tk.Canvas(self.main_frame)
-        self.scrollbar = ctk.CTkScrollbar(self.main_frame, orientation="vertical", command=self.canvas.yview)
-        self.scrollable_frame = ctk.CTkFrame(self.canvas)
-
-        # Configure the canvas
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(
-                scrollregion=self.canvas.bbox("all")
-            )
-        )
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        # Pack the canvas and scrollbar
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
-
-        # Add mouse wheel support for scrolling
-        self.bind_mouse_wheel(self.canvas)
-
         # Add a label for instructions
         self.instruction_label = ctk.CTkLabel(
-            self.scrollable_frame,
+            self.main_frame,
             text="Select employees to include in the schedule:",
             font=("Arial", 14, "bold")
         )
-        self.instruction_label.pack(pady=(10, 5), anchor="w")
+        self.instruction_label.pack(pady=(10, 5), padx=10, anchor="w")
 
-        # Add checkboxes for each employee inside the scrollable frame
-        self.checkbox_vars = {}
-        for i, emp in enumerate(self.employees):
-            var = tk.BooleanVar(value=self.selection_state.get(emp["name"], True))
-            checkbox = ctk.CTkCheckBox(self.scrollable_frame, text=emp["name"], variable=var)
-            checkbox.pack(anchor="w", pady=5, padx=10)
-            self.checkbox_vars[emp["name"]] = var
+        # Only the visible checkboxes exist; they are recycled while scrolling
+        self.employee_list = VirtualList(self.main_frame, self.create_checkbox_row, self.update_checkbox_row)
+        self.employee_list.pack(fill="both", expand=True)
+
+        # Add mouse wheel support for scrolling
+        self.canvas = self.employee_list.canvas
+        self.bind_mouse_wheel(self.canvas)
+
+        self.loader = ChunkedLoader(self, (emp["name"] for emp in iter_employees()), self.add_names)
 
         # Add a button frame at the bottom for the "Confirm" button
         self.button_frame = ctk.CTkFrame(self)
@@ -82,26 +65,59 @@ class EmployeeSelection(ctk.CTkToplevel):
         elif platform.system() == "Darwin":  # macOS
             widget.bind_all("<MouseWheel>", lambda e: widget.yview_scroll(int(-1 * e.delta), "units"))
 
+    def add_names(self, names):
+        """Append a chunk of streamed employee names to the list."""
+        for name in names:
+            self.selected[name] = self.selection_state.get(name, True)
+        self.names.extend(names)
+        self.employee_list.extend(names)
+
+    def create_checkbox_row(self, parent):
+        """Create one reusable checkbox row."""
+        checkbox = ctk.CTkCheckBox(parent, text="", variable=tk.BooleanVar(value=False))
+        checkbox.configure(command=lambda: self.toggle_employee(checkbox))
+        checkbox.employee_name = None
+        return checkbox
+
+    def update_checkbox_row(self, checkbox, name):
+        """Point a recycled checkbox at another employee."""
+        checkbox.employee_name = name
+        checkbox.configure(text=name)
+        if self.selected[name]:
+            checkbox.select()
+        else:
+            checkbox.deselect()
+
+    def toggle_employee(self, checkbox):
+        """Record a checkbox click against the employee it currently shows."""
+        self.selected[checkbox.employee_name] = bool(checkbox.get())
+
     def load_selection_state(self):
         """Load the selection state of employees from a JSON file."""
+        if SERVICE_URL:
+            return get_employee_store().get_selection()
         try:
-            with open("employee_selection.json", "r") as file:
+            with open(SELECTION_FILE, "r") as file:
                 return json.load(file)
         except FileNotFoundError:
             return {}
 
     def save_selection_state(self):
         """Save the selection state of employees to a JSON file."""
-        selection_state = {emp["name"]: var.get() for emp, var in zip(self.employees, self.checkbox_vars.values())}
+        selection_state = dict(self.selected)
         try:
-            with open("employee_selection.json", "w") as file:
+            if SERVICE_URL:
+                get_employee_store().put_selection(selection_state)
+                return
+            with open(SELECTION_FILE, "w") as file:
                 json.dump(selection_state, file)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save selection state: {e}")
 
     def confirm_selection(self):
         """Confirm the selection and pass the selected employees to the callback."""
-        selected_employees = [emp["name"] for emp, var in zip(self.employees, self.checkbox_vars.values()) if var.get()]
+        self.loader.drain()
+        selected_employees = [name for name in self.names if self.selected[name]]
         self.save_selection_state()
         self.callback(selected_employees)
         self.destroy()
\ No newline at end of file
@@ -0,0 +1,178 @@
+# employee_store.py
+#
+# SQLite-backed employee store. Records are keyed by their normalized name
+# with secondary indexes on store and hour key, so single-employee lookups,
+# inserts and updates no longer read or rewrite the whole roster. The
+# database runs in WAL mode so readers never block on a writer.
+
+import json
+import sqlite3
+from roster import normalize_name
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL UNIQUE,
+    collab TEXT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS employee_stores (
+    employee_id INTEGER NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
+    store TEXT NOT NULL,
+    PRIMARY KEY (employee_id, store)
+);
+CREATE TABLE IF NOT EXISTS employee_hours (
+    employee_id INTEGER NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
+    hour TEXT NOT NULL,
+    PRIMARY KEY (employee_id, hour)
+);
+CREATE INDEX IF NOT EXISTS employee_stores_store ON employee_stores (store);
+CREATE INDEX IF NOT EXISTS employee_hours_hour ON employee_hours (hour);
+"""
+
+
+class EmployeeStore:
+    """Indexed employee records in a SQLite database."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+
+    def data_version(self):
+        """Return a number that changes when another connection commits."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def iter_all(self):
+        """Yield every employee record in insertion order."""
+        for (record,) in self.conn.execute("SELECT record FROM employees ORDER BY id"):
+            yield json.loads(record)
+
+    def all(self):
+        """Return every employee record in insertion order."""
+        return list(self.iter_all())
+
+    def get(self, name):
+        """Return the record for name (case-insensitive), or None."""
+        row = self.conn.execute(
+            "SELECT record FROM employees WHERE name_key = ?", (normalize_name(name),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def has_name(self, name):
+        """Check if an employee name already exists (case-insensitive)."""
+        return self.conn.execute(
+            "SELECT 1 FROM employees WHERE name_key = ?", (normalize_name(name),)
+        ).fetchone() is not None
+
+    def names_for_store(self, store):
+        """Return the names of employees available at a store."""
+        rows = self.conn.execute(
+            "SELECT e.name FROM employee_stores s JOIN employees e ON e.id = s.employee_id "
+            "WHERE s.store = ? ORDER BY e.id", (store,)
+        )
+        return [name for (name,) in rows]
+
+    def names_for_hour(self, hour):
+        """Return the names of employees available for an hour key such as "AM SUN"."""
+        rows = self.conn.execute(
+            "SELECT e.name FROM employee_hours h JOIN employees e ON e.id = h.employee_id "
+            "WHERE h.hour = ? ORDER BY e.id", (hour,)
+        )
+        return [name for (name,) in rows]
+
+    def add(self, record):
+        """Insert a new employee; raise ValueError if the name is taken."""
+        with self.conn:
+            self._insert(record)
+
+    def add_many(self, records):
+        """Insert many employees in a single transaction."""
+        with self.conn:
+            for record in records:
+                self._insert(record)
+
+    def update(self, name, record):
+        """Replace the record currently stored under name."""
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT id FROM employees WHERE name_key = ?", (normalize_name(name),)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"No employee named {name}")
+            employee_id = row[0]
+            try:
+                self.conn.execute(
+                    "UPDATE employees SET name = ?, name_key = ?, collab = ?, record = ? WHERE id = ?",
+                    (record["name"], normalize_name(record["name"]), record.get("collab"),
+                     json.dumps(record), employee_id)
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError("Employee name already exists (case-insensitive)!")
+            self.conn.execute("DELETE FROM employee_stores WHERE employee_id = ?", (employee_id,))
+            self.conn.execute("DELETE FROM employee_hours WHERE employee_id = ?", (employee_id,))
+            self._insert_availability(employee_id, record)
+
+    def delete(self, name):
+        """Remove the employee stored under name."""
+        with self.conn:
+            self.conn.execute("DELETE FROM employees WHERE name_key = ?", (normalize_name(name),))
+
+    def replace_all(self, records):
+        """Replace the whole roster with records in a single transaction."""
+        with self.conn:
+            self.conn.execute("DELETE FROM employees")
+            for record in records:
+                self._insert(record)
+
+    def migrate_from_jsonl(self, path):
+        """Import a JSON Lines employee file if the store is empty; return the count imported."""
+        if len(self):
+            return 0
+        from employee_log import iter_records
+        records = list(iter_records(path))
+        self.add_many(records)
+        return len(records)
+
+    def _insert(self, record):
+        try:
+            cursor = self.conn.execute(
+                "INSERT INTO employees (name, name_key, collab, record) VALUES (?, ?, ?, ?)",
+                (record["name"], normalize_name(record["name"]), record.get("collab"), json.dumps(record))
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError("Employee name already exists (case-insensitive)!")
+        self._insert_availability(cursor.lastrowid, record)
+
+    def _insert_availability(self, employee_id, record):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO employee_stores (employee_id, store) VALUES (?, ?)",
+            [(employee_id, store) for store in record["stores"]]
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO employee_hours (employee_id, hour) VALUES (?, ?)",
+            [(employee_id, hour) for hour in record["hours"]]
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migrate a JSON Lines employee file into SQLite.")
+    parser.add_argument("source", help="JSON Lines employee file, e.g. employee.json")
+    parser.add_argument("database", help="SQLite database to create or fill")
+    args = parser.parse_args()
+
+    store = EmployeeStore(args.database)
+    print(f"Imported {store.migrate_from_jsonl(args.source)} employees into {args.database}")
+    store.close()
\ No newline at end of file
@@ -0,0 +1,191 @@
+# feasibility.py
+#
+# Pre-solve check of supply against demand, worked out from the availability
+# index alone: slots with fewer candidates than their headcount target,
+# employees that more slots depend on than they can work, collaborator pairs
+# that can never share a shift, and an upper bound on the positions (and so
+# the score) any solve can reach. It runs in milliseconds, so the GUI and
+# CLI report gaps before solving and multistart stops at the bound.
+
+from availability import AvailabilityIndex, iter_bits, mask_from_positions
+from constants import MAX_SHIFTS
+from profiling import profiled
+from scoring import COLLAB_BONUS
+from slots import slot_table
+
+
+def _count(mask):
+    return bin(mask).count("1")
+
+
+class FeasibilityReport:
+    """What a solve over these employees and slots can reach at best."""
+
+    def __init__(self, demand, max_filled, short_cells, bottlenecks, unpaired, collab_possible):
+        self.demand = demand              # Positions wanted in the week
+        self.max_filled = max_filled      # Upper bound on the positions any solve can fill
+        self.short_cells = short_cells    # (day, shift, store, candidates, target) below their target
+        self.bottlenecks = bottlenecks    # (name, slots needing them, slots they can take), worst first
+        self.unpaired = unpaired          # (name, collaborator, reason) for preferences that cannot be met
+        self.collab_possible = collab_possible  # True if some collaborator pair can share a shift
+
+    @property
+    def feasible(self):
+        """True if nothing rules out filling every position."""
+        return self.max_filled >= self.demand
+
+    @property
+    def coverage_bound(self):
+        return self.max_filled / self.demand if self.demand else 1.0
+
+    @property
+    def max_score(self):
+        """Upper bound on scoring.evaluate's score: best coverage, no imbalance, full collab bonus."""
+        return 100.0 * self.coverage_bound + (COLLAB_BONUS if self.collab_possible else 0.0)
+
+    def summary(self):
+        """One line for status bars and logs."""
+        if self.feasible:
+            return f"All {self.demand} positions can be staffed"
+        parts = [f"At most {self.max_filled} of {self.demand} positions can be staffed ({self.coverage_bound:.0%})"]
+        if self.short_cells:
+            parts.append(f"{len(self.short_cells)} slots lack candidates")
+        if self.bottlenecks:
+            parts.append(f"{len(self.bottlenecks)} employees are needed for more slots than they can work")
+        return "; ".join(parts)
+
+    def lines(self, limit=20):
+        """Return the summary and up to ``limit`` lines per kind of problem."""
+        lines = [self.summary()]
+        for day, shift, store, candidates, target in self.short_cells[:limit]:
+            lines.append(f"  {day} {shift} {store}: {candidates} of {target} needed")
+        if len(self.short_cells) > limit:
+            lines.append(f"  ... {len(self.short_cells) - limit} more short slots")
+        for name, needed, possible in self.bottlenecks[:limit]:
+            lines.append(f"  {name}: needed for {needed} slots with no spare candidates, can work {possible}")
+        if len(self.bottlenecks) > limit:
+            lines.append(f"  ... {len(self.bottlenecks) - limit} more overcommitted employees")
+        for name, partner, reason in self.unpaired[:limit]:
+            lines.append(f"  {name} -> {partner}: {reason}")
+        if len(self.unpaired) > limit:
+            lines.append(f"  ... {len(self.unpaired) - limit} more unmet collaborator preferences")
+        return lines
+
+
+@profiled("feasibility")
+def check_feasibility(employees, stores, days, shifts, constraints=None, index=None):
+    """Compare candidates with headcount targets for every slot; return a FeasibilityReport.
+
+    ``index`` may be an AvailabilityIndex built for a larger roster, as for
+    solver.solve. The position bound follows the solve mode's rules: nobody
+    works more than their shift limit, and in "optimal" mode nobody works
+    two stores in one shift (the "random" sampler does not enforce that).
+    """
+    if index is None:
+        index = AvailabilityIndex(employees)
+        open_mask = index.all_mask
+    else:
+        open_mask = index.mask_for(employees)
+    table = slot_table(stores, days, shifts, constraints)
+    caps = index.shift_caps(MAX_SHIFTS if constraints is None else constraints.max_shifts)
+    one_store = constraints is not None and constraints.mode == "optimal"
+
+    store_masks = [index.store_masks.get(store, 0) & open_mask for store in table.stores]
+    any_store = 0
+    for mask in store_masks:
+        any_store |= mask
+
+    short_cells = []
+    tight = []  # (day, shift, candidates) where every candidate is needed
+    slot_bound = 0
+    at_least = []  # at_least[k]: employees who can work more than k of the (day, shift)s
+    cell = 0
+    for day, hour_keys in zip(table.days, table.hour_keys):
+        for shift, key in zip(table.shifts, hour_keys):
+            hour_mask = index.hour_masks.get(key, 0) & open_mask
+            shift_fill = 0
+            for store, store_mask in zip(table.stores, store_masks):
+                target = table.targets[cell]
+                cell += 1
+                if not target:
+                    continue
+                candidates = store_mask & hour_mask
+                supply = _count(candidates)
+                shift_fill += min(target, supply)
+                if supply < target:
+                    short_cells.append((day, shift, store, supply, target))
+                if candidates and supply <= target:
+                    tight.append((day, shift, candidates))
+            if one_store:
+                # Each candidate fills at most one store per shift
+                shift_mask = hour_mask & any_store
+                shift_fill = min(shift_fill, _count(shift_mask))
+                at_least.append(0)
+                for k in range(len(at_least) - 1, 0, -1):
+                    at_least[k] |= at_least[k - 1] & shift_mask
+                at_least[0] |= shift_mask
+            slot_bound += shift_fill
+
+    # Each employee fills at most their shift limit, and with one store per
+    # shift no more than the number of shifts they can work
+    by_cap = {}
+    for i in iter_bits(open_mask & any_store):
+        by_cap.setdefault(caps[i], []).append(i)
+    if one_store:
+        cap_masks = {cap: mask_from_positions(positions, len(index)) for cap, positions in by_cap.items()}
+        employee_bound = 0
+        for k, mask in enumerate(at_least):
+            under_cap = 0
+            for cap, cap_mask in cap_masks.items():
+                if cap > k:
+                    under_cap |= cap_mask
+            employee_bound += _count(mask & under_cap)
+    else:
+        employee_bound = sum(cap * len(positions) for cap, positions in by_cap.items())
+
+    return FeasibilityReport(
+        table.demand, min(slot_bound, employee_bound), short_cells,
+        _bottlenecks(index, tight, caps, one_store), *_collab_preferences(index, employees, table)
+    )
+
+
+def _bottlenecks(index, tight, caps, one_store):
+    """Employees that more fully-needed slots depend on than they can work."""
+    needed = {}
+    for day, shift, candidates in tight:
+        for i in iter_bits(candidates):
+            needed.setdefault(i, []).append((day, shift))
+    found = []
+    for i, slots in needed.items():
+        possible = min(caps[i], len(set(slots)) if one_store else len(slots))
+        if len(slots) > possible:
+            found.append((index.employees[i]["name"], len(slots), possible))
+    found.sort(key=lambda item: (item[2] - item[1], item[0]))
+    return found
+
+
+def _collab_preferences(index, employees, table):
+    """Return (unmet preferences, whether any pair can share a shift)."""
+    collab = index.collab
+    if not collab:
+        return [], False
+    records = {emp["name"]: emp for emp in employees}
+    stores = set(table.stores)
+    hours = {key for hour_keys in table.hour_keys for key in hour_keys}
+    unpaired = []
+    possible = False
+    for name, partner in collab.partners.items():
+        if name not in records:
+            continue
+        other = records.get(partner)
+        if other is None:
+            unpaired.append((name, partner, "not selected" if partner in index.positions else "not on the roster"))
+            continue
+        # Both are available for a slot when they share a store and an hour
+        record = records[name]
+        if (stores.intersection(record["stores"], other["stores"])
+                and hours.intersection(record["hours"], other["hours"])):
+            possible = True
+        else:
+            unpaired.append((name, partner, "never available for the same slot"))
+    return unpaired, possible
\ No newline at end of file
@@ -0,0 +1,181 @@
+# flow_solver.py
+#
+# Optimizing solve mode: a min-cost max-flow over
+#
+#   source -> employee -> (employee, day, shift) -> (day, shift, store) -> sink
+#
+# Source edges carry each employee's shift limit with an increasing cost per
+# extra shift, so the cheapest maximum flow also spreads work evenly. The
+# (employee, day, shift) layer keeps anyone from working two stores at once.
+
+import heapq
+import time
+from availability import iter_bits
+
+BALANCE_COST = 16  # Cost step for each additional shift given to one employee
+TIE_BREAK_RANGE = 8  # Seeded random costs that break ties between equal choices
+
+
+class _FlowGraph:
+    """Residual graph stored as flat edge arrays."""
+
+    def __init__(self):
+        self.head = []
+        self.to = []
+        self.cap = []
+        self.cost = []
+        self.next = []
+
+    def add_node(self):
+        self.head.append(-1)
+        return len(self.head) - 1
+
+    def add_edge(self, u, v, cap, cost):
+        for a, b, c, w in ((u, v, cap, cost), (v, u, 0, -cost)):
+            self.to.append(b)
+            self.cap.append(c)
+            self.cost.append(w)
+            self.next.append(self.head[a])
+            self.head[a] = len(self.to) - 1
+        return len(self.to) - 2
+
+    def shortest_path(self, source, sink, potential):
+        """Dijkstra on reduced costs; return the parent edge of each reached node.
+
+        Ties are popped newest-first so the search runs down one path to the
+        sink instead of settling every equally cheap employee first.
+        """
+        head, to, cap, cost, nxt = self.head, self.to, self.cap, self.cost, self.next
+        dist = {source: 0}
+        parent = {}
+        done = set()
+        order = 0
+        heap = [(0, 0, source)]
+        while heap:
+            d, _, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            if u == sink:
+                break
+            e = head[u]
+            while e != -1:
+                if cap[e] > 0:
+                    v = to[e]
+                    nd = d + cost[e] + potential[u] - potential[v]
+                    if v not in done and nd < dist.get(v, nd + 1):
+                        dist[v] = nd
+                        parent[v] = e
+                        order -= 1
+                        heapq.heappush(heap, (nd, order, v))
+                e = nxt[e]
+        if sink not in done:
+            return None
+        # Nodes not settled before the sink are at least as far as the sink.
+        # Every potential should grow by min(dist, limit); unreached nodes would
+        # grow by limit, and since only potential differences matter we shift
+        # everything down by limit and touch the reached nodes only.
+        limit = dist[sink]
+        for v, d in dist.items():
+            if d < limit:
+                potential[v] += d - limit
+        return parent
+
+
+def solve_min_cost_flow(index, open_mask, table, constraints, rng, progress=None, cancel=None):
+    """Return {(day, shift, store): [roster positions]} from a min-cost max-flow.
+
+    ``table`` is the SlotTable giving each slot's headcount target. Returns an
+    empty result as soon as ``cancel`` is set.
+    """
+    graph = _FlowGraph()
+    source = graph.add_node()
+    sink = graph.add_node()
+
+    caps = index.shift_caps(constraints.max_shifts)
+    slot_edges = []  # (edge id, cell id, day, shift, store, roster position)
+    employee_nodes = {}
+    for i in iter_bits(open_mask):
+        node = graph.add_node()
+        employee_nodes[i] = node
+        # Adjacency lists are scanned newest-first: add the cheapest edge last.
+        for k in reversed(range(caps[i])):
+            graph.add_edge(source, node, 1, (k + 1) * BALANCE_COST)
+
+    store_masks = [index.store_masks.get(store, 0) for store in table.stores]
+    cell = -1
+    for day, hour_keys in zip(table.days, table.hour_keys):
+        for shift, key in zip(table.shifts, hour_keys):
+            hour_mask = index.hour_masks.get(key, 0) & open_mask
+            if not hour_mask:
+                cell += len(store_masks)
+                continue
+            period_nodes = {}
+            for store, store_mask in zip(table.stores, store_masks):
+                cell += 1
+                candidates = store_mask & hour_mask
+                if not candidates or not table.targets[cell]:
+                    continue
+                slot = graph.add_node()
+                graph.add_edge(slot, sink, table.targets[cell], 0)
+                for i in iter_bits(candidates):
+                    period = period_nodes.get(i)
+                    if period is None:
+                        period = period_nodes[i] = graph.add_node()
+                        graph.add_edge(employee_nodes[i], period, 1, 0)
+                    edge = graph.add_edge(period, slot, 1, rng.randrange(TIE_BREAK_RANGE))
+                    slot_edges.append((edge, cell, day, shift, store, i))
+
+    deadline = None
+    if constraints.time_budget is not None:
+        deadline = time.monotonic() + constraints.time_budget
+
+    total = table.demand
+    filled = 0
+    potential = [0] * len(graph.head)
+    finished = False
+    while deadline is None or time.monotonic() < deadline:
+        if cancel is not None and cancel.is_set():
+            return {}
+        parent = graph.shortest_path(source, sink, potential)
+        if parent is None:
+            finished = True
+            break
+        # Every path carries one unit: the employee layer has unit capacities.
+        v = sink
+        while v != source:
+            e = parent[v]
+            graph.cap[e] -= 1
+            graph.cap[e ^ 1] += 1
+            v = graph.to[e ^ 1]
+        filled += 1
+        if progress is not None:
+            progress(filled, total)
+
+    cells = {}
+    for edge, _, day, shift, store, i in slot_edges:
+        if graph.cap[edge] == 0:
+            cells.setdefault((day, shift, store), []).append(i)
+    if not finished:
+        _fill_greedily(cells, slot_edges, table, caps)
+    return cells
+
+
+def _fill_greedily(cells, slot_edges, table, caps):
+    """Top up slots left short when the time budget ran out, first come first served."""
+    counts = {}
+    busy = set()
+    for (day, shift, store), selected in cells.items():
+        for i in selected:
+            counts[i] = counts.get(i, 0) + 1
+            busy.add((i, day, shift))
+
+    for edge, cell, day, shift, store, i in slot_edges:
+        selected = cells.setdefault((day, shift, store), [])
+        if len(selected) >= table.targets[cell] or (i, day, shift) in busy:
+            continue
+        if counts.get(i, 0) >= caps[i]:
+            continue
+        selected.append(i)
+        counts[i] = counts.get(i, 0) + 1
+        busy.add((i, day, shift))
\ No newline at end of file
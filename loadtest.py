@@ -0,0 +1,207 @@
+# loadtest.py
+#
+# Load test for the schedule service (service.py). Opens --concurrency
+# keep-alive connections that send requests back to back for --duration
+# seconds, then prints requests per second and latency percentiles as JSON:
+#
+#   python loadtest.py --employees 2000 --concurrency 50 --duration 10
+#   python loadtest.py --url http://127.0.0.1:8765 --scenario generate
+#
+# Without --url a service is started on a free port in a temporary directory
+# with a synthetic roster, and stopped afterwards.
+#
+# Scenarios:
+#   version    GET /version (roster thread round trip)
+#   employees  GET /employees (the whole roster)
+#   generate   POST /generate over --distinct seeds (solves, coalescing, cache)
+#   mixed      70% version, 20% generate, 10% employees
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+from benchmark import summarize
+from constants import EMPLOYEE_FILE
+from service_client import ServiceClient, ServiceError
+from synthetic_roster import write_roster
+
+SCENARIOS = ("version", "employees", "generate", "mixed")
+
+
+def make_picker(scenario, distinct, mode, rng):
+    """Return a function giving the next (method, path, body) for a scenario."""
+    generate_bodies = [
+        json.dumps({"mode": mode, "seed": seed}).encode("utf-8") for seed in range(distinct)
+    ]
+    requests = {
+        "version": lambda: ("GET", "/version", b""),
+        "employees": lambda: ("GET", "/employees", b""),
+        "generate": lambda: ("POST", "/generate", rng.choice(generate_bodies)),
+    }
+    if scenario != "mixed":
+        return requests[scenario]
+
+    def mixed():
+        roll = rng.random()
+        if roll < 0.7:
+            return requests["version"]()
+        if roll < 0.9:
+            return requests["generate"]()
+        return requests["employees"]()
+    return mixed
+
+
+async def send(reader, writer, host, method, path, body):
+    """Send one request on an open connection; return the response status."""
+    head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n"
+    if body:
+        head += "Content-Type: application/json\r\n"
+    writer.write(head.encode("latin-1") + b"\r\n" + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def worker(host, port, deadline, pick, latencies, counts):
+    """One connection sending requests back to back until the deadline."""
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        if writer is None:
+            reader, writer = await asyncio.open_connection(host, port)
+        method, path, body = pick()
+        start = time.perf_counter()
+        try:
+            status = await send(reader, writer, host, method, path, body)
+        except (ConnectionError, asyncio.IncompleteReadError, IndexError, ValueError):
+            counts["errors"] += 1
+            writer.close()
+            writer = None
+            continue
+        if status == 200:
+            latencies.append(time.perf_counter() - start)
+            counts["ok"] += 1
+        elif status == 503:
+            counts["busy"] += 1
+            await asyncio.sleep(0.05)  # Back off as the Retry-After header asks
+        else:
+            counts["errors"] += 1
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(host, port, scenario, args):
+    rng = random.Random(args.seed)
+    pick = make_picker(scenario, args.distinct, args.mode, rng)
+    latencies = []
+    counts = {"ok": 0, "busy": 0, "errors": 0}
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        worker(host, port, deadline, pick, latencies, counts) for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    result = {
+        "scenario": scenario,
+        "concurrency": args.concurrency,
+        "duration_s": elapsed,
+        **counts,
+        "rps": counts["ok"] / elapsed,
+    }
+    if latencies:
+        result.update(summarize(latencies))
+        del result["repeat"]
+    return result
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_service(directory, args):
+    """Start service.py in directory with a synthetic roster; return (process, url)."""
+    write_roster(os.path.join(directory, EMPLOYEE_FILE), args.employees, density=args.density, seed=args.seed)
+    port = free_port()
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "service.py"),
+               "--port", str(port)]
+    if args.workers is not None:
+        command += ["--workers", str(args.workers)]
+    env = {key: value for key, value in os.environ.items()
+           if key not in ("SCHEDULE_GEN_SERVICE", "SCHEDULE_GEN_DB")}
+    process = subprocess.Popen(command, cwd=directory, env=env)
+    url = f"http://127.0.0.1:{port}"
+    client = ServiceClient(url)
+    deadline = time.monotonic() + 60
+    while True:
+        try:
+            client.health()
+            return process, url
+        except ServiceError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise SystemExit("The service did not start")
+            time.sleep(0.1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="loadtest.py", description="Load test the schedule service.")
+    parser.add_argument("--url", help="Running service to test (default: start one with a synthetic roster)")
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append",
+                        help="Request mix; repeat for several runs (default: all of them)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Open connections (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per scenario (default: %(default)s)")
+    parser.add_argument("--distinct", type=int, default=8,
+                        help="Different schedules the generate requests ask for (default: %(default)s)")
+    parser.add_argument("--mode", default="random", help="Solver mode for generate requests (default: %(default)s)")
+    parser.add_argument("--employees", type=int, default=1000,
+                        help="Synthetic roster size when starting a service (default: %(default)s)")
+    parser.add_argument("--density", type=float, default=0.4, help="Fraction of hours each employee is available")
+    parser.add_argument("--workers", type=int, help="Solver processes for a started service")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the roster and request mix")
+    parser.add_argument("--out", help="Also write the JSON results to this file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scenarios = args.scenario or list(SCENARIOS)
+    with tempfile.TemporaryDirectory() as directory:
+        process = None
+        url = args.url
+        if url is None:
+            process, url = start_service(directory, args)
+        try:
+            parts = urllib.parse.urlsplit(url)
+            results = [asyncio.run(run_load(parts.hostname, parts.port or 80, scenario, args))
+                       for scenario in scenarios]
+            report = {"url": url, "results": results, "service": ServiceClient(url).health()}
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as file:
+            file.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,14 +1,31 @@
 # main.py
+#
+# The launcher imports only what the three-button window needs. Each dialog
+# module is imported the first time its button is clicked, and the roster is
+# loaded on a background thread once the window has painted. Set
+# SCHEDULE_GEN_STARTUP_TIMING=1 to print import and first-paint times
+# ("exit" also closes the window once the roster is warm).
 
+import time
+
+_started = time.perf_counter()
+
+import os
+import sys
+import threading
 import customtkinter as ctk
-from employee_form import EmployeeForm
-from employee_list import EmployeeList
-from schedule_generator import ScheduleGenerator
-from employee_selection import EmployeeSelection
+from tkinter import filedialog, messagebox
+
+STARTUP_TIMING_ENV = "SCHEDULE_GEN_STARTUP_TIMING"
+
+_imported = time.perf_counter()
+
 
 class MainPage(ctk.CTk):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.timing = os.environ.get(STARTUP_TIMING_ENV, "").strip().lower()
+        self.timings = {"imports": _imported - _started}
         self.title("Employee Management System")
         self.geometry("400x300")
 
@@ -21,8 +38,50 @@ class MainPage(ctk.CTk):
         self.generateScheduleButton = ctk.CTkButton(self, text="Generate Schedule", command=self.open_employee_selection)
         self.generateScheduleButton.pack(pady=10)
 
+        self.importEmployeesButton = ctk.CTkButton(self, text="Import Employees", command=self.import_employees)
+        self.importEmployeesButton.pack(pady=10)
+
+        self.schedule_window = None  # Most recent ScheduleGenerator, kept in sync with edits
+        self.warm_thread = None
+
+        # Idle callbacks run in order, so this one fires after the window is drawn
+        self.after_idle(self.first_paint)
+
+    def first_paint(self):
+        """Record the first-paint time and start warming up the roster."""
+        self.timings["first_paint"] = time.perf_counter() - _started
+        from constants import EMPLOYEE_DB, SERVICE_URL
+        if EMPLOYEE_DB and not SERVICE_URL:
+            self.warm_up()  # SQLite connections belong to the thread that opened them
+        else:
+            self.warm_thread = threading.Thread(target=self.warm_up, daemon=True)
+            self.warm_thread.start()
+        if self.timing and self.timing != "0":
+            self.report_startup()
+
+    def warm_up(self):
+        """Load the roster and its availability index before the first dialog needs them."""
+        start = time.perf_counter()
+        try:
+            from roster import get_roster
+            get_roster().index
+        except Exception:
+            return  # The dialog that needs the roster will report the problem
+        self.timings["roster_warm_up"] = time.perf_counter() - start
+
+    def report_startup(self):
+        """Print the startup timings to stderr once the warm-up has finished."""
+        if self.warm_thread is not None and self.warm_thread.is_alive():
+            self.after(20, self.report_startup)
+            return
+        print("startup: " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.timings.items()),
+              file=sys.stderr)
+        if self.timing == "exit":
+            self.destroy()
+
     def open_employee_form(self):
         """Open the employee form."""
+        from employee_form import EmployeeForm
         form = EmployeeForm(self)
         form.grab_set()
         form.focus_force()
@@ -30,13 +89,38 @@ class MainPage(ctk.CTk):
     def open_employee_list(self):
         """Open the employee list for editing."""
         try:
+            from employee_list import EmployeeList
             EmployeeList(self)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open employee list: {e}")
 
+    def import_employees(self):
+        """Add employees in bulk from a CSV or JSON Lines file."""
+        path = filedialog.askopenfilename(
+            parent=self, filetypes=[("Employee files", "*.csv *.json *.jsonl"), ("All files", "*")]
+        )
+        if not path:
+            return
+        try:
+            from roster_import import import_file
+            report = import_file(path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to import employees: {e}")
+            return
+        message = report.summary()
+        if report.rejected:
+            lines = [f"Row {row}: {name or '?'}: {reason}" for row, name, reason in report.rejected[:15]]
+            if len(report.rejected) > 15:
+                lines.append(f"... and {len(report.rejected) - 15} more")
+            message += "\n\n" + "\n".join(lines)
+            messagebox.showwarning("Import", message)
+        else:
+            messagebox.showinfo("Success", message)
+
     def open_employee_selection(self):
         """Open the employee selection menu before generating the schedule."""
         try:
+            from employee_selection import EmployeeSelection
             EmployeeSelection(self, self.generate_schedule)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open employee selection: {e}")
@@ -44,10 +128,20 @@ class MainPage(ctk.CTk):
     def generate_schedule(self, selected_employees):
         """Generate and display the schedule for selected employees."""
         try:
-            ScheduleGenerator(self, selected_employees)
+            from schedule_generator import ScheduleGenerator
+            self.schedule_window = ScheduleGenerator(self, selected_employees)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate schedule: {e}")
 
+    def employee_updated(self, old_record, new_record):
+        """Repair the open schedule, if any, instead of regenerating it."""
+        window = self.schedule_window
+        if window is not None and window.winfo_exists() and hasattr(window, "schedule"):
+            try:
+                window.repair_employee(old_record, new_record)
+            except Exception as e:
+                messagebox.showerror("Error", f"The employee was saved, but the open schedule could not be updated: {e}")
+
 if __name__ == "__main__":
     app = MainPage()
     app.mainloop()
\ No newline at end of file
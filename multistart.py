@@ -0,0 +1,88 @@
+# multistart.py
+#
+# Best-of-N search: run several independently seeded solves, score each one
+# and keep the best. Passes run in worker processes and the search stops as
+# soon as one of them reaches the target score.
+
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from feasibility import check_feasibility
+from roster_snapshot import release, resolve, share
+from solver import Constraints, solve
+
+
+def _solve_pass(job):
+    employees, stores, days, shifts, constraints = job
+    index, employees = resolve(employees)
+    return solve(employees, stores, days, shifts, constraints, index=index)
+
+
+def _better(schedule, best):
+    """Higher score wins; equal scores go to the lower seed so results are stable."""
+    if best is None:
+        return True
+    if schedule.stats["score"] != best.stats["score"]:
+        return schedule.stats["score"] > best.stats["score"]
+    return schedule.seed < best.seed
+
+
+def solve_best_of(employees, stores, days, shifts, constraints=None, starts=8, workers=None,
+                  target_score=None, index=None):
+    """Run ``starts`` seeded solves and return the best Schedule.
+
+    Pass k uses seed ``constraints.seed + k`` (a random base seed is drawn when
+    none is given), and the winner's seed is recorded on the returned
+    schedule, so ``solve(..., constraints.with_seed(schedule.seed))``
+    regenerates it exactly. Once a pass reaches ``target_score`` the remaining
+    passes are cancelled; a target above the feasibility bound is lowered to
+    the bound, since no pass can score more. When nothing can be staffed at
+    all every pass would return the same empty schedule, so only one runs.
+    ``schedule.stats["passes"]`` reports how many passes finished. ``index``
+    is passed to the feasibility check and in-process solves, as for solve().
+    """
+    if constraints is None:
+        constraints = Constraints()
+    report = check_feasibility(employees, stores, days, shifts, constraints, index=index)
+    if target_score is not None:
+        target_score = min(target_score, report.max_score)
+    if not report.max_filled:
+        starts = 1
+    base_seed = random.randrange(2 ** 32) if constraints.seed is None else constraints.seed
+    passes = [constraints.with_seed(base_seed + k) for k in range(starts)]
+    workers = min(workers or os.cpu_count() or 1, starts)
+
+    best = None
+    finished = 0
+    if workers <= 1:
+        for pass_constraints in passes:
+            schedule = solve(employees, stores, days, shifts, pass_constraints, index=index)
+            finished += 1
+            if _better(schedule, best):
+                best = schedule
+            if target_score is not None and best.stats["score"] >= target_score:
+                break
+    else:
+        shared = share(employees)  # A SnapshotRef when the records come from the roster snapshot
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = {
+                    executor.submit(_solve_pass, (shared, stores, days, shifts, pass_constraints))
+                    for pass_constraints in passes
+                }
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        schedule = future.result()
+                        finished += 1
+                        if _better(schedule, best):
+                            best = schedule
+                    if target_score is not None and best.stats["score"] >= target_score:
+                        for future in pending:
+                            future.cancel()
+                        break
+        finally:
+            release(shared)
+
+    best.stats["passes"] = finished
+    return best
\ No newline at end of file
@@ -0,0 +1,102 @@
+# parallel.py
+#
+# Multi-process generation. Stores only interact through the employees they
+# share (each employee's shift counter), so the store list is split into
+# connected components of store overlap and every component is solved in
+# its own worker process. The partial schedules are merged afterwards.
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from roster_snapshot import release, resolve, share
+from scoring import evaluate
+from schedule_grid import Schedule
+from slots import slot_table
+from solver import Constraints, solve
+
+
+def store_components(employees, stores):
+    """Group stores that share at least one employee; return lists in store order."""
+    parent = {store: store for store in stores}
+
+    def find(store):
+        while parent[store] != store:
+            parent[store] = parent[parent[store]]
+            store = parent[store]
+        return store
+
+    for emp in employees:
+        linked = [store for store in emp["stores"] if store in parent]
+        for store in linked[1:]:
+            root_a, root_b = find(linked[0]), find(store)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+    groups = {}
+    for store in stores:
+        groups.setdefault(find(store), []).append(store)
+    return list(groups.values())
+
+
+def partition(employees, stores):
+    """Split a solve into independent (stores, employees) sub-problems."""
+    jobs = []
+    for component in store_components(employees, stores):
+        members = set(component)
+        jobs.append((component, [emp for emp in employees if members.intersection(emp["stores"])]))
+    return jobs
+
+
+def _solve_job(job):
+    stores, employees, days, shifts, constraints = job
+    index, employees = resolve(employees)
+    return solve(employees, stores, days, shifts, constraints, index=index)
+
+
+def submit_jobs(executor, jobs, days, shifts, constraints):
+    """Submit one future per (stores, employees) sub-problem from partition().
+
+    Employees from the snapshot-loaded roster are sent as a SnapshotRef, so
+    workers map the roster snapshot instead of unpickling the records; each
+    ref is released when its future finishes.
+    """
+    futures = []
+    for component, members in jobs:
+        shared = share(members)
+        future = executor.submit(_solve_job, (component, shared, days, shifts, constraints))
+        future.add_done_callback(lambda _, shared=shared: release(shared))
+        futures.append(future)
+    return futures
+
+
+def merge(parts, employees, stores, days, shifts, constraints):
+    """Combine component schedules into one Schedule over all stores."""
+    schedule = Schedule(days, shifts, stores, slot_table(stores, days, shifts, constraints).capacity)
+    for part in parts:
+        for (day, shift, store), names in part.iter_cells():
+            schedule.assign(day, shift, store, names)
+    schedule.stats = evaluate(schedule, employees, constraints)
+    schedule.seed = constraints.seed
+    return schedule
+
+
+def solve_parallel(employees, stores, days, shifts, constraints=None, workers=None):
+    """Solve each store component in its own process and return the merged Schedule.
+
+    The result depends only on the roster and the seed, not on ``workers``;
+    ``workers=1`` solves the same components in this process.
+    """
+    if constraints is None:
+        constraints = Constraints()
+    if constraints.seed is None:
+        # Every component must share one recorded seed to be reproducible
+        constraints = constraints.with_seed(random.randrange(2 ** 32))
+    jobs = partition(employees, stores)
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+    if workers <= 1:
+        parts = [solve(members, component, days, shifts, constraints) for component, members in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = [future.result() for future in submit_jobs(executor, jobs, days, shifts, constraints)]
+    return merge(parts, employees, stores, days, shifts, constraints)
\ No newline at end of file
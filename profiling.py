@@ -0,0 +1,206 @@
+# profiling.py
+#
+# Opt-in instrumentation for the load -> solve -> render path. Code marks its
+# phases with ``with phase("solve"):`` or ``@profiled("render")``; while
+# profiling is off these return immediately, so they can stay in hot paths.
+#
+# Turn it on with SCHEDULE_GEN_PROFILE (or cli.py --profile), set to a comma
+# separated list of:
+#
+#   timers      wall time and call count per phase (always on)
+#   cprofile    dump a cProfile .prof file per run
+#   tracemalloc also record peak memory per phase and dump the top allocations;
+#               without it the peak memory column stays 0
+#
+# e.g. SCHEDULE_GEN_PROFILE=timers,tracemalloc python main.py. Each run's
+# summary is appended to PROFILE_LOG; dumps go to PROFILE_DIR.
+
+import contextlib
+import cProfile
+import functools
+import os
+import threading
+import time
+import tracemalloc
+
+PROFILE_ENV = "SCHEDULE_GEN_PROFILE"
+PROFILE_DIR = "profiles"
+PROFILE_LOG = os.path.join(PROFILE_DIR, "profile.log")
+FEATURES = ("timers", "cprofile", "tracemalloc")
+
+_enabled = False
+_features = set()
+_lock = threading.Lock()
+_stats = {}               # Phase name -> [calls, total seconds, slowest seconds, peak bytes]
+_local = threading.local()  # Per-thread stack of open phases (for nested peak memory)
+_NULL = contextlib.nullcontext()
+
+
+def enable(features=("timers",)):
+    """Turn profiling on with the given FEATURES (timers are always included)."""
+    global _enabled
+    unknown = set(features) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown profiling feature(s): {', '.join(sorted(unknown))}")
+    _features.clear()
+    _features.update(features)
+    _features.add("timers")
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    _features.clear()
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget the phase statistics collected so far."""
+    with _lock:
+        _stats.clear()
+
+
+def phase(name):
+    """Context manager that times one phase; a no-op while profiling is off."""
+    if not _enabled:
+        return _NULL
+    return _Phase(name)
+
+
+def profiled(name):
+    """Decorator form of phase()."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class _Phase:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.tracing = tracemalloc.is_tracing()
+        if self.tracing:
+            # Fold the peak so far into the enclosing phase before resetting it
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.base = current
+        self.peak = 0
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        _local.stack.pop()
+        peak_bytes = 0
+        if self.tracing and tracemalloc.is_tracing():
+            peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            peak_bytes = peak - self.base
+            if _local.stack:
+                _local.stack[-1].peak = max(_local.stack[-1].peak, peak)
+        with _lock:
+            entry = _stats.setdefault(self.name, [0, 0.0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += elapsed
+            entry[2] = max(entry[2], elapsed)
+            entry[3] = max(entry[3], peak_bytes)
+        return False
+
+
+def snapshot():
+    """Return {phase: {"calls", "total_ms", "max_ms", "peak_kb"}} for the phases seen so far."""
+    with _lock:
+        return {
+            name: {
+                "calls": calls,
+                "total_ms": total * 1000,
+                "max_ms": slowest * 1000,
+                "peak_kb": peak / 1024,
+            }
+            for name, (calls, total, slowest, peak) in _stats.items()
+        }
+
+
+def summary(title="profile"):
+    """Return the phase statistics as a text table, slowest phase first."""
+    stats = snapshot()
+    lines = [f"== {title} ({time.strftime('%Y-%m-%d %H:%M:%S')})",
+             f"{'phase':<24}{'calls':>8}{'total ms':>12}{'max ms':>12}{'peak KB':>12}"]
+    for name, entry in sorted(stats.items(), key=lambda item: -item[1]["total_ms"]):
+        lines.append(f"{name:<24}{entry['calls']:>8}{entry['total_ms']:>12.2f}"
+                     f"{entry['max_ms']:>12.2f}{entry['peak_kb']:>12.1f}")
+    return "\n".join(lines) + "\n"
+
+
+def write_summary(title):
+    """Append summary(title) to PROFILE_LOG."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(PROFILE_LOG, "a") as file:
+        file.write(summary(title) + "\n")
+
+
+@contextlib.contextmanager
+def run(label, log=True, fresh=True):
+    """Profile one run (a generation, a CLI command) in the calling thread.
+
+    With ``fresh`` the statistics start from zero. cProfile and tracemalloc
+    dumps are written at the end, and with ``log`` the summary too. Does
+    nothing while profiling is off.
+    """
+    if not _enabled:
+        yield
+        return
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    profiler = None
+    started_tracing = False
+    if "tracemalloc" in _features and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started_tracing = True
+    if "cprofile" in _features:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if fresh:
+        reset()
+    try:
+        with phase(label):
+            yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(PROFILE_DIR, f"{label}-{stamp}.prof"))
+        if tracemalloc.is_tracing():
+            top = tracemalloc.take_snapshot().statistics("lineno")[:25]
+            with open(os.path.join(PROFILE_DIR, f"{label}-{stamp}-memory.txt"), "w") as file:
+                file.writelines(f"{stat}\n" for stat in top)
+            if started_tracing:
+                tracemalloc.stop()
+        if log:
+            write_summary(label)
+
+
+def enable_from_env():
+    """Enable profiling if SCHEDULE_GEN_PROFILE is set (e.g. "1", "timers,cprofile")."""
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if value and value != "0":
+        features = [f.strip() for f in value.split(",") if f.strip() and f.strip() not in ("1", "on")]
+        enable(features)
+
+
+enable_from_env()
\ No newline at end of file
@@ -0,0 +1,101 @@
+# repair.py
+#
+# Incremental re-scheduling after one employee's record changes. Only the
+# slots that employee worked or newly qualifies for are touched; every other
+# assignment stays as it was.
+
+import random
+from availability import hour_key, iter_bits
+from slots import slot_table
+
+
+def _qualifies(record, day, shift, store):
+    return store in record["stores"] and hour_key(day, shift) in record["hours"]
+
+
+def _busy(schedule, name, day, shift):
+    """True if name already works some store during (day, shift)."""
+    return any(d == day and s == shift for d, s, _ in schedule.slots_of(name))
+
+
+def repair_schedule(schedule, index, old_record, new_record, constraints, selected=None):
+    """Patch schedule in place for an edited employee; return the slots that changed.
+
+    ``index`` is the AvailabilityIndex the schedule was solved with; it is
+    updated to the new record, so pass one the caller owns. ``selected`` is
+    the set of names that may be scheduled (None means everyone in the
+    index). The work done depends on the number of affected slots, not on
+    the size of the grid. An employee the index does not know (added after
+    the solve) cannot be in the schedule, so nothing changes.
+    """
+    old_name, new_name = old_record["name"], new_record["name"]
+    if old_name not in index.positions:
+        return set()
+    index.update(old_name, new_record)
+    if selected is not None and old_name in selected:
+        selected.discard(old_name)
+        selected.add(new_name)
+    rng = random.Random(schedule.seed)
+    table = slot_table(schedule.stores, schedule.days, schedule.shifts, constraints)
+    new_cap = new_record.get("max_shifts") or constraints.max_shifts
+    changed = set()
+
+    # Drop the employee from slots they no longer qualify for, and from those
+    # past a lowered shift limit, and carry the rest over under the (possibly
+    # new) name. Slots are visited in grid order, so the earliest are kept.
+    def grid_order(slot):
+        day, shift, store = slot
+        return schedule.days.index(day), schedule.shifts.index(shift), schedule.stores.index(store)
+
+    vacated = []
+    kept = 0
+    for day, shift, store in sorted(schedule.slots_of(old_name), key=grid_order):
+        schedule.remove(day, shift, store, old_name)
+        if kept < new_cap and _qualifies(new_record, day, shift, store):
+            schedule.add(day, shift, store, new_name)
+            kept += 1
+            if new_name != old_name:
+                changed.add((day, shift, store))
+        else:
+            vacated.append((day, shift, store))
+            changed.add((day, shift, store))
+
+    # Offer the employee any short slot they have just become available for,
+    # visiting only the record's own hours and stores in grid order.
+    if selected is None or new_name in selected:
+        busy = {(day, shift) for day, shift, _ in schedule.slots_of(new_name)}
+        stores = [store for store in schedule.stores if store in new_record["stores"]]
+        hours = sorted(table.hour_slots[key] for key in new_record["hours"] if key in table.hour_slots)
+        for day_id, shift_id in hours:
+            day, shift = table.days[day_id], table.shifts[shift_id]
+            if (day, shift) in busy:
+                continue
+            for store in stores:
+                if _qualifies(old_record, day, shift, store):
+                    continue  # Not newly available: the original solve already considered them
+                if schedule.count_of(new_name) >= new_cap:
+                    break
+                if len(schedule.get(day, shift, store)) < table.target(day, shift, store):
+                    schedule.add(day, shift, store, new_name)
+                    busy.add((day, shift))
+                    changed.add((day, shift, store))
+                    break  # One store per shift
+
+    # Refill vacated slots from the other employees, keeping everyone else fixed.
+    for day, shift, store in vacated:
+        working = set(schedule.get(day, shift, store))
+        candidates = []
+        for i in iter_bits(index.slot_mask(day, shift, store)):
+            record = index.employees[i]
+            name = record["name"]
+            if name in working or name == new_name or (selected is not None and name not in selected):
+                continue
+            cap = record.get("max_shifts") or constraints.max_shifts
+            if schedule.count_of(name) >= cap or _busy(schedule, name, day, shift):
+                continue
+            candidates.append(name)
+        missing = table.target(day, shift, store) - len(working)
+        for name in rng.sample(candidates, min(missing, len(candidates))):
+            schedule.add(day, shift, store, name)
+
+    return changed
\ No newline at end of file
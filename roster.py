@@ -0,0 +1,293 @@
+# roster.py
+#
+# Shared, parse-once view of the employee roster. Every dialog and the
+# solver read through get_roster(), which re-reads the backing file only
+# when its mtime/size changes or when a writer calls invalidate_roster().
+# The JSON Lines file is loaded through its binary snapshot (roster_snapshot.py).
+# Edits go through add_employees(), update_employee() and delete_employee(),
+# which write to the SQLite store or the employee file's append-only log.
+# This module must stay free of tkinter so headless callers can use it.
+
+import os
+import threading
+from constants import EMPLOYEE_FILE, EMPLOYEE_DB, SERVICE_URL, STORES
+from profiling import phase
+from slots import SLOT_TABLE
+
+
+def normalize_name(name):
+    """Return the key used to compare employee names (case-insensitive)."""
+    return name.strip().lower()
+
+
+def validate_name(name):
+    """Validate the employee name."""
+    if not name:
+        return "Name is required!"
+    if not name.replace(" ", "").isalpha():
+        return "Name should only contain alphabets and spaces."
+    return None
+
+
+def validate_record(record):
+    """Validate an employee record before it is written; return an error message or None."""
+    name = record.get("name")
+    error = validate_name(name.strip() if isinstance(name, str) else None)
+    if error:
+        return error
+    stores, hours = record.get("stores"), record.get("hours")
+    if not isinstance(stores, list) or not isinstance(hours, list):
+        return "Stores and hours must be lists."
+    unknown = [str(store) for store in stores if not isinstance(store, str) or store not in STORES]
+    if unknown:
+        return f"Unknown store(s): {', '.join(unknown)}"
+    unknown = [str(hour) for hour in hours if not isinstance(hour, str) or hour not in SLOT_TABLE.hour_slots]
+    if unknown:
+        return f"Unknown hour(s): {', '.join(unknown)}"
+    if not stores:
+        return "At least one store must be selected."
+    if not hours:
+        return "At least one hour must be selected."
+    if not isinstance(record.get("collab"), str):
+        return "The collaborator must be a name or \"No Collab\"."
+    max_shifts = record.get("max_shifts", 1)
+    if isinstance(max_shifts, bool) or not isinstance(max_shifts, int) or max_shifts < 1:
+        return f"Invalid max shifts: {max_shifts!r}"
+    return None
+
+
+class Roster:
+    """Parsed employee records plus derived lookups. Treat as read-only."""
+
+    def __init__(self, employees, index=None):
+        self.employees = employees
+        self._by_name = None
+        self._name_keys = None
+        self._sorted_names = None
+        self._index = index  # Prebuilt when loaded from a roster snapshot
+        self._fingerprint = None
+
+    def __len__(self):
+        return len(self.employees)
+
+    @property
+    def by_name(self):
+        """Dict of employee name -> record."""
+        if self._by_name is None:
+            self._by_name = {emp["name"]: emp for emp in self.employees}
+        return self._by_name
+
+    @property
+    def name_keys(self):
+        """Set of normalized names, for case-insensitive duplicate checks."""
+        if self._name_keys is None:
+            self._name_keys = {normalize_name(emp["name"]) for emp in self.employees}
+        return self._name_keys
+
+    @property
+    def sorted_names(self):
+        """Employee names sorted case-insensitively."""
+        if self._sorted_names is None:
+            self._sorted_names = sorted((emp["name"] for emp in self.employees), key=lambda x: x.lower())
+        return self._sorted_names
+
+    @property
+    def index(self):
+        """AvailabilityIndex over the whole roster, built on first use."""
+        if self._index is None:
+            from availability import AvailabilityIndex
+            self._index = AvailabilityIndex(self.employees)
+        return self._index
+
+    @property
+    def fingerprint(self):
+        """Hash of the normalized records, used to key cached schedules."""
+        if self._fingerprint is None:
+            from schedule_cache import roster_fingerprint
+            self._fingerprint = roster_fingerprint(self.employees)
+        return self._fingerprint
+
+
+class RosterCache:
+    """Caches the parsed roster until the source changes or is invalidated."""
+
+    def __init__(self, path=EMPLOYEE_FILE, store=None):
+        self.path = path
+        self.store = store
+        self.version = 0
+        self._key = None
+        self._roster = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Force the next get() to reload; call after every write."""
+        self.version += 1
+
+    def peek(self):
+        """Return the cached Roster if it is still current, otherwise None."""
+        if self._roster is not None and self._source_key() == self._key:
+            return self._roster
+        return None
+
+    def get(self):
+        """Return the current Roster, re-reading the source only if it changed."""
+        # The lock lets a dialog wait for the launcher's background warm-up
+        # instead of loading the file a second time.
+        with self._lock:
+            key = self._source_key()
+            if self._roster is None or key != self._key:
+                self._roster = self._load(key[1:])
+                self._key = key
+            return self._roster
+
+    def _source_key(self):
+        if self.store is not None:
+            # data_version moves when another client commits; our own
+            # commits are covered by invalidate().
+            return self.version, self.store.data_version()
+        from employee_log import log_path_for
+        return self.version, _stat_key(self.path), _stat_key(log_path_for(self.path))
+
+    def _load(self, source_key):
+        with phase("load_roster"):
+            if self.store is not None:
+                return Roster(list(self.iter_source()))
+            # The binary snapshot next to the file skips the JSON parse when it is current
+            from roster_snapshot import load_roster
+            return load_roster(self.path, source_key)
+
+    def iter_source(self):
+        """Yield records straight from the backing file or store, one at a time."""
+        if self.store is not None:
+            yield from self.store.iter_all()
+            return
+        from employee_log import iter_records
+        yield from iter_records(self.path)
+
+
+def _stat_key(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+_employee_store = None
+_employee_log = None
+_roster_cache = None
+# The launcher's warm-up thread and the Tk thread both reach these; an RLock
+# because _get_cache() creates the store while holding it
+_globals_lock = threading.RLock()
+
+
+def get_employee_store():
+    """Return the schedule service client or SQLite store if one is configured, otherwise None."""
+    global _employee_store
+    if _employee_store is None and (SERVICE_URL or EMPLOYEE_DB):
+        with _globals_lock:
+            if SERVICE_URL and _employee_store is None:
+                from service_client import ServiceClient
+                _employee_store = ServiceClient(SERVICE_URL)
+            elif EMPLOYEE_DB and _employee_store is None:
+                from employee_store import EmployeeStore
+                store = EmployeeStore(EMPLOYEE_DB)
+                store.migrate_from_jsonl(EMPLOYEE_FILE)
+                _employee_store = store  # Published only once migrated
+    return _employee_store
+
+
+def get_employee_log():
+    """Return the EmployeeLog used to edit EMPLOYEE_FILE when no store is configured."""
+    global _employee_log
+    if _employee_log is None:
+        with _globals_lock:
+            if _employee_log is None:
+                from employee_log import EmployeeLog
+                _employee_log = EmployeeLog(EMPLOYEE_FILE)
+    return _employee_log
+
+
+def _get_cache():
+    global _roster_cache
+    if _roster_cache is None:
+        with _globals_lock:
+            if _roster_cache is None:
+                _roster_cache = RosterCache(EMPLOYEE_FILE, get_employee_store())
+    return _roster_cache
+
+
+def get_roster():
+    """Return the shared Roster for the configured employee source."""
+    return _get_cache().get()
+
+
+def iter_employees():
+    """Yield employee records lazily, from the cache if it is current or else the source."""
+    cache = _get_cache()
+    roster = cache.peek()
+    if roster is not None:
+        return iter(roster.employees)
+    return cache.iter_source()
+
+
+def invalidate_roster():
+    """Mark the shared roster stale after writing employees."""
+    if _roster_cache is not None:
+        _roster_cache.invalidate()
+
+
+def add_employees(records):
+    """Add new employee records in one write; raise ValueError on a duplicate name."""
+    try:
+        store = get_employee_store()
+        if store is not None:
+            store.add_many(records)
+        else:
+            get_employee_log().add_many(records)
+    finally:
+        invalidate_roster()
+
+
+def replace_employees(records):
+    """Replace the whole roster with records in one write."""
+    try:
+        store = get_employee_store()
+        if store is not None:
+            store.replace_all(records)
+        else:
+            get_employee_log().replace_all(records)
+    finally:
+        invalidate_roster()
+
+
+def update_employee(old_record, new_record):
+    """Replace old_record (found by its id, or by name) with new_record."""
+    try:
+        store = get_employee_store()
+        if store is not None:
+            store.update(old_record["name"], new_record)
+            return
+        log = get_employee_log()
+        employee_id = old_record.get("id")
+        if employee_id is None:
+            employee_id = log.id_for_name(old_record["name"])
+        log.update(employee_id, new_record)
+    finally:
+        invalidate_roster()
+
+
+def delete_employee(record):
+    """Remove an employee (found by its id, or by name)."""
+    try:
+        store = get_employee_store()
+        if store is not None:
+            store.delete(record["name"])
+            return
+        log = get_employee_log()
+        employee_id = record.get("id")
+        if employee_id is None:
+            employee_id = log.id_for_name(record["name"])
+        log.delete(employee_id)
+    finally:
+        invalidate_roster()
\ No newline at end of file
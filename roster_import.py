@@ -0,0 +1,288 @@
+# roster_import.py
+#
+# Bulk import of employees from CSV (HR exports) or JSON Lines. All rows are
+# parsed and validated first, duplicates are found with one set of
+# normalized names, and the accepted records are written in a single
+# transaction (one SQLite transaction, or one fsynced append to the employee
+# log). Rows that fail validation are returned in the report, never written.
+#
+# CSV columns are matched by header, case-insensitively:
+#   name / employee / full name        the employee name
+#   stores                             store names separated by ; , or |
+#   LEHI, SANDY, ...                   one column per store, marked x/yes/1
+#   hours                              hour keys such as "AM SUN; PM MON"
+#   AM SUN, Sunday AM, sun_am, ...     one column per hour, marked x/yes/1
+#   collab / collaborator              preferred collaborator (optional)
+#   max shifts                         weekly shift limit (optional)
+
+import csv
+import json
+import os
+import re
+from availability import hour_key
+from constants import STORES, DAYS, SHIFTS
+from slots import SLOT_TABLE
+from roster import add_employees, get_roster, normalize_name, validate_name, validate_record
+
+NAME_COLUMNS = ("name", "employee", "employee name", "full name")
+COLLAB_COLUMNS = ("collab", "collaborator", "collaborate")
+MAX_SHIFTS_COLUMNS = ("max shifts", "max_shifts", "maxshifts")
+TRUE_VALUES = {"1", "x", "y", "yes", "true", "t", "available"}
+NO_COLLAB = "No Collab"
+
+_DAY_CODES = {day[:3].upper(): day for day in DAYS}
+_SPLIT = re.compile(r"[;,|]")
+
+
+class ImportReport:
+    """Outcome of an import: accepted records and (row number, name, reason) rejections."""
+
+    def __init__(self):
+        self.accepted = []
+        self.rejected = []
+        self.committed = False
+
+    def reject(self, row_number, name, reason):
+        self.rejected.append((row_number, name, reason))
+
+    def summary(self):
+        state = "Imported" if self.committed else "Would import"
+        return f"{state} {len(self.accepted)} employees; rejected {len(self.rejected)} rows."
+
+    def write_rejections(self, path):
+        """Write the rejected rows to a CSV file."""
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["row", "name", "reason"])
+            writer.writerows(self.rejected)
+
+
+def normalize_display_name(name):
+    """Trim a name and collapse runs of whitespace to single spaces."""
+    return " ".join(str(name or "").split())
+
+
+def _hour_for_header(header):
+    """Map a column header such as "AM SUN", "Sunday AM" or "sun_am" to an hour key, or None."""
+    tokens = re.split(r"[\s_\-/]+", header.strip().upper())
+    shifts = [token for token in tokens if token in SHIFTS]
+    days = [_DAY_CODES[token[:3]] for token in tokens if token[:3] in _DAY_CODES and token not in SHIFTS]
+    if len(shifts) == 1 and len(days) == 1 and len(tokens) == 2:
+        return hour_key(days[0], shifts[0])
+    return None
+
+
+def _split_list(value):
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [item.strip() for item in _SPLIT.split(value or "") if item.strip()]
+
+
+def _canonical_stores(values):
+    """Return (stores, unknown) with store names matched case-insensitively."""
+    by_key = {store.upper(): store for store in STORES}
+    stores, unknown = [], []
+    for value in values:
+        store = by_key.get(value.upper())
+        if store is None:
+            unknown.append(value)
+        elif store not in stores:
+            stores.append(store)
+    return stores, unknown
+
+
+def _canonical_hours(values):
+    """Return (hours, unknown); accepts "AM SUN" keys and variants like "Sunday AM"."""
+    hours, unknown = [], []
+    for value in values:
+        key = _hour_for_header(value)
+        if key is None:
+            unknown.append(value)
+        elif key not in hours:
+            hours.append(key)
+    return hours, unknown
+
+
+def iter_csv_rows(path):
+    """Yield (row number, raw record) from a CSV file, mapping columns by header."""
+    with open(path, "r", newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [column.strip() for column in header]
+        lowered = [column.lower() for column in columns]
+
+        def find(names):
+            return next((i for i, column in enumerate(lowered) if column in names), None)
+
+        name_col = find(NAME_COLUMNS)
+        if name_col is None:
+            raise ValueError(f"No name column found; expected one of: {', '.join(NAME_COLUMNS)}")
+        collab_col = find(COLLAB_COLUMNS)
+        max_shifts_col = find(MAX_SHIFTS_COLUMNS)
+        stores_col = find(("stores", "store"))
+        hours_col = find(("hours", "availability"))
+        store_by_key = {store.upper(): store for store in STORES}
+        store_cols = [(i, store_by_key[column.upper()]) for i, column in enumerate(columns)
+                      if column.upper() in store_by_key]
+        hour_cols = [(i, key) for i, key in ((i, _hour_for_header(column)) for i, column in enumerate(columns))
+                     if key is not None]
+
+        for row_number, row in enumerate(reader, start=2):
+            if not any(cell.strip() for cell in row):
+                continue
+            row = row + [""] * (len(columns) - len(row))
+            stores = _split_list(row[stores_col]) if stores_col is not None else []
+            stores += [store for i, store in store_cols if row[i].strip().lower() in TRUE_VALUES]
+            hours = _split_list(row[hours_col]) if hours_col is not None else []
+            hours += [key for i, key in hour_cols if row[i].strip().lower() in TRUE_VALUES]
+            yield row_number, {
+                "name": row[name_col],
+                "stores": stores,
+                "hours": hours,
+                "collab": row[collab_col] if collab_col is not None else "",
+                "max_shifts": row[max_shifts_col] if max_shifts_col is not None else "",
+            }
+
+
+def iter_jsonl_rows(path):
+    """Yield (line number, raw record) from a JSON Lines file in the employee.json format."""
+    with open(path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                record = {"error": f"Invalid JSON: {e}"}
+            if not isinstance(record, dict):
+                record = {"error": "Not a JSON object"}
+            yield line_number, record
+
+
+def read_rows(path, fmt=None):
+    """Yield (row number, raw record) for a .csv or .json/.jsonl file."""
+    if fmt is None:
+        fmt = "csv" if os.path.splitext(path)[1].lower() == ".csv" else "jsonl"
+    if fmt == "csv":
+        return iter_csv_rows(path)
+    if fmt == "jsonl":
+        return iter_jsonl_rows(path)
+    raise ValueError(f"Unknown import format: {fmt}")
+
+
+def _resolve_collab(collab, known_names):
+    """Return the roster spelling of a collaborator, NO_COLLAB for none, or None if unknown."""
+    if not collab or collab in ("None", NO_COLLAB):
+        return NO_COLLAB
+    return known_names.get(normalize_name(collab))
+
+
+def validate_rows(rows, existing_names):
+    """Turn raw rows into employee records; return an ImportReport (nothing is written).
+
+    ``existing_names`` are the names already on the roster. Collaborators
+    may be existing employees or accepted rows of the same import; when a
+    name appears in several rows the first accepted one wins.
+    """
+    report = ImportReport()
+    existing = {normalize_name(name): name for name in existing_names}
+    rejected = []    # (row number, name, reason)
+    candidates = []  # (row number, name key, record) for rows whose own fields are valid
+    for row_number, raw in rows:
+        if "error" in raw:
+            rejected.append((row_number, "", raw["error"]))
+            continue
+        name = normalize_display_name(raw.get("name"))
+        error = validate_name(name)
+        if error:
+            rejected.append((row_number, name, error))
+            continue
+        key = normalize_name(name)
+        if key in existing:
+            rejected.append((row_number, name, "Employee name already exists (case-insensitive)!"))
+            continue
+        stores, unknown_stores = _canonical_stores(_split_list(raw.get("stores")))
+        hours, unknown_hours = _canonical_hours(_split_list(raw.get("hours")))
+        if unknown_stores:
+            rejected.append((row_number, name, f"Unknown store(s): {', '.join(unknown_stores)}"))
+            continue
+        if unknown_hours:
+            rejected.append((row_number, name, f"Unknown hour(s): {', '.join(unknown_hours)}"))
+            continue
+        max_shifts = str(raw.get("max_shifts") or "").strip()
+        if max_shifts and not max_shifts.isdecimal():
+            rejected.append((row_number, name, f"Invalid max shifts: {max_shifts}"))
+            continue
+        record = {
+            "name": name,
+            "stores": [store for store in STORES if store in stores],
+            "hours": [hour for keys in SLOT_TABLE.hour_keys for hour in keys if hour in hours],
+            "collab": normalize_display_name(raw.get("collab")),
+        }
+        if max_shifts:
+            record["max_shifts"] = int(max_shifts)
+        # The same checks the service applies to records it is sent
+        error = validate_record(record)
+        if error:
+            rejected.append((row_number, name, error))
+            continue
+        candidates.append((row_number, key, record))
+
+    # Rejecting a row for its collaborator promotes the next row with the same
+    # name, or, if there is none, removes the name, so the rows naming it as
+    # their collaborator must be checked again. A worklist re-checks only
+    # those rows, so each row is checked a bounded number of times.
+    rows_for = {}  # Name key -> its row numbers in file order
+    named_by = {}  # Collaborator key -> row numbers naming it
+    by_row = {}    # Row number -> (name key, record)
+    for row_number, key, record in candidates:
+        rows_for.setdefault(key, []).append(row_number)
+        by_row[row_number] = key, record
+        if _resolve_collab(record["collab"], {}) != NO_COLLAB:
+            named_by.setdefault(normalize_name(record["collab"]), []).append(row_number)
+    winners = {key: rows[0] for key, rows in rows_for.items()}
+    next_row = dict.fromkeys(rows_for, 1)
+    known_names = dict(existing)
+    known_names.update((key, by_row[row_number][1]["name"]) for key, row_number in winners.items())
+    bad_collab = set()
+    pending = list(winners.values())
+    while pending:
+        row_number = pending.pop()
+        key, record = by_row[row_number]
+        if winners.get(key) != row_number or _resolve_collab(record["collab"], known_names) is not None:
+            continue
+        bad_collab.add(row_number)
+        if next_row[key] < len(rows_for[key]):
+            row_number = winners[key] = rows_for[key][next_row[key]]
+            next_row[key] += 1
+            known_names[key] = by_row[row_number][1]["name"]
+            pending.append(row_number)
+        else:
+            del winners[key], known_names[key]
+            pending.extend(named_by.get(key, ()))
+
+    for row_number, key, record in candidates:
+        if row_number in bad_collab:
+            rejected.append((row_number, record["name"], f"Unknown collaborator: {record['collab']}"))
+        elif winners.get(key) != row_number:
+            rejected.append((row_number, record["name"], "Employee name already exists (case-insensitive)!"))
+        else:
+            record["collab"] = _resolve_collab(record["collab"], known_names)
+            report.accepted.append(record)
+    for row_number, name, reason in sorted(rejected, key=lambda item: item[0]):
+        report.reject(row_number, name, reason)
+    return report
+
+
+def import_file(path, fmt=None, dry_run=False):
+    """Validate a CSV/JSON Lines file and add the accepted employees in one write.
+
+    Returns the ImportReport; with ``dry_run`` nothing is written.
+    """
+    report = validate_rows(read_rows(path, fmt), get_roster().by_name)
+    if report.accepted and not dry_run:
+        add_employees(report.accepted)
+        report.committed = True
+    return report
\ No newline at end of file
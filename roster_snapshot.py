@@ -0,0 +1,449 @@
+# roster_snapshot.py
+#
+# Binary roster snapshot, so processes can skip parsing the JSON Lines
+# employee file. After a JSON parse the roster is written next to the file
+# (employee.json.bin); later loads memory-map it instead. Layout, with every
+# section padded to 8 bytes:
+#
+#   header    magic, format version, the stat keys of the employee file and
+#             its log when the snapshot was taken, and the section sizes
+#   strings   every name, collaborator, store, hour key and extra-field blob
+#             once, as "\0"-separated UTF-8
+#   columns   fixed-width, one entry per employee: name, collaborator and
+#             extra-field string ids (u32), record id (i32), "max_shifts"
+#             (u16, 0 = unset), and the employee's stores and hour keys as
+#             u64 bitmasks over the two tables below
+#   stores    the string id of each store, then one bitset over employees per store
+#   hours     the string id of each "AM SUN"-style key, then one bitset per key
+#
+# The per-key bitsets are the AvailabilityIndex masks, so the index costs one
+# int.from_bytes per store and hour key; the per-employee bitmasks rebuild
+# each record's lists with a byte-wise table lookup. Columns use the machine's
+# byte order: the snapshot is a local cache, never copied between hosts.
+# A snapshot whose stat keys no longer match the file and log is stale and
+# is rewritten on the next load.
+# Loading still decodes every record into a dict; what the snapshot saves is
+# the JSON parse and the index build, not the copy into Python objects.
+# Worker processes are sent a SnapshotRef (a selection mask over a pinned
+# hard link to the snapshot) instead of pickled records. The link keeps
+# that version of the snapshot alive while the roster is edited and
+# rewritten, and is removed when the last job using it is released.
+
+import itertools
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from availability import AvailabilityIndex, mask_from_positions
+from constants import STORES
+from employee_log import iter_records
+from roster import Roster
+from slots import SLOT_TABLE
+
+MAGIC = b"RSNP"
+VERSION = 1
+# magic, version, reserved, file mtime/size, log mtime/size,
+# employees, strings, stores, hour keys, string bytes
+HEADER = struct.Struct("<4sHH4q5I")
+NONE = 0xFFFFFFFF  # String id of a missing value
+MAX_KEYS = 64      # Stores or hour keys that fit a per-employee bitmask column
+STANDARD_KEYS = frozenset(("name", "stores", "hours", "collab", "id", "max_shifts"))  # Keys with columns
+
+
+def snapshot_path_for(path):
+    return path + ".bin"
+
+
+def _key_from(fields):
+    """Return the stat key stored in unpacked header fields."""
+    file_mtime, file_size, log_mtime, log_size = fields[3:7]
+    return (
+        (file_mtime, file_size) if file_mtime >= 0 else None,
+        (log_mtime, log_size) if log_mtime >= 0 else None,
+    )
+
+
+def read_key(path):
+    """Return the stat key of the snapshot at path, or None if it is missing or unreadable."""
+    try:
+        with open(path, "rb") as file:
+            fields = HEADER.unpack(file.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    if fields[:2] != (MAGIC, VERSION):
+        return None
+    return _key_from(fields)
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+def _layout(employees, stores, hours, string_bytes):
+    """Return the offset of each section and the total size."""
+    offsets = {}
+    position = _padded(HEADER.size)
+    row_bytes = _padded((employees + 7) // 8)
+    for name, size in (("strings", string_bytes), ("name_ids", 4 * employees), ("collab_ids", 4 * employees),
+                       ("extra_ids", 4 * employees), ("record_ids", 4 * employees), ("max_shifts", 2 * employees),
+                       ("employee_stores", 8 * employees), ("employee_hours", 8 * employees),
+                       ("store_ids", 4 * stores), ("hour_ids", 4 * hours),
+                       ("store_bits", row_bytes * stores), ("hour_bits", row_bytes * hours)):
+        offsets[name] = position
+        position += _padded(size)
+    return offsets, row_bytes, position
+
+
+def _pack_key(key):
+    return tuple(value for stat in key for value in (stat or (-1, -1)))
+
+
+def _key_decoder(keys):
+    """Return a function turning a bitmask over keys into the list of keys, one byte at a time."""
+    tables = [
+        [[keys[start + j] for j in range(min(8, len(keys) - start)) if value >> j & 1] for value in range(256)]
+        for start in range(0, len(keys), 8)
+    ]
+    if not tables:
+        return lambda bits: []
+    if len(tables) == 1:
+        low = tables[0]
+        return lambda bits: low[bits][:]
+    if len(tables) == 2:
+        low, high = tables
+        return lambda bits: low[bits & 255] + high[bits >> 8]
+    return lambda bits: [key for i, table in enumerate(tables) for key in table[bits >> 8 * i & 255]]
+
+
+def write_snapshot(path, roster, key):
+    """Write the snapshot of a Roster read from the employee file at path.
+
+    ``key`` is the (file, log) stat key the roster was read at. Returns
+    False, writing nothing, if a record cannot be stored in this format.
+    """
+    records = roster.employees
+    index = roster.index
+    strings = {}
+
+    def string_id(value):
+        i = strings.get(value)
+        if i is None:
+            i = strings[value] = len(strings)
+        return i
+
+    # Catalog order first, so decoded lists keep the order the form writes them in
+    stores = list(STORES) + sorted(set(index.store_masks) - set(STORES))
+    catalog_hours = [hour for keys in SLOT_TABLE.hour_keys for hour in keys]
+    hours = catalog_hours + sorted(set(index.hour_masks) - set(catalog_hours))
+    if len(stores) > MAX_KEYS or len(hours) > MAX_KEYS:
+        return False
+    store_bit = {store: 1 << k for k, store in enumerate(stores)}
+    hour_bit = {hour: 1 << k for k, hour in enumerate(hours)}
+
+    columns = {name: array("I") for name in ("name_ids", "collab_ids", "extra_ids")}
+    record_ids = array("i")
+    max_shifts = array("H")
+    employee_stores = array("Q")
+    employee_hours = array("Q")
+    for record in records:
+        name, record_stores, record_hours = record.get("name"), record.get("stores"), record.get("hours")
+        if not isinstance(name, str) or not isinstance(record_stores, list) or not isinstance(record_hours, list):
+            return False
+        try:
+            store_bits = sum(store_bit[store] for store in record_stores)
+            hour_bits = sum(hour_bit[hour] for hour in record_hours)
+        except (KeyError, TypeError):
+            return False
+        # A repeated entry would collapse into one bit
+        if bin(store_bits).count("1") != len(record_stores) or bin(hour_bits).count("1") != len(record_hours):
+            return False
+
+        collab = record.get("collab")
+        record_id = record.get("id", -1)
+        cap = record.get("max_shifts", 0)
+        extra = None
+        if not STANDARD_KEYS.issuperset(record) or not (
+                ("collab" not in record or isinstance(collab, str)) and isinstance(record_id, int)
+                and 0 <= record_id + 1 <= 2 ** 31 and isinstance(cap, int) and 0 <= cap < 2 ** 16):
+            # Anything without a column of its own is kept as a JSON blob
+            extra = {k: v for k, v in record.items() if k not in STANDARD_KEYS}
+            if "collab" in record and not isinstance(collab, str):
+                extra["collab"] = collab
+                collab = None
+            if not isinstance(record_id, int) or not 0 <= record_id < 2 ** 31:
+                extra["id"] = record_id
+                record_id = -1
+            if not isinstance(cap, int) or not 0 <= cap < 2 ** 16:
+                extra["max_shifts"] = cap
+                cap = 0
+        columns["name_ids"].append(string_id(name))
+        columns["collab_ids"].append(NONE if collab is None else string_id(collab))
+        columns["extra_ids"].append(string_id(json.dumps(extra)) if extra else NONE)
+        record_ids.append(record_id)
+        max_shifts.append(cap)
+        employee_stores.append(store_bits)
+        employee_hours.append(hour_bits)
+
+    store_ids = array("I", [string_id(store) for store in stores])
+    hour_ids = array("I", [string_id(hour) for hour in hours])
+    if any("\0" in value for value in strings):
+        return False
+    blob = "\0".join(strings).encode("utf-8")
+
+    count = len(records)
+    offsets, row_bytes, size = _layout(count, len(store_ids), len(hour_ids), len(blob))
+    data = bytearray(size)
+    HEADER.pack_into(data, 0, MAGIC, VERSION, 0, *_pack_key(key), count, len(strings),
+                     len(store_ids), len(hour_ids), len(blob))
+    sections = dict(columns, strings=blob, record_ids=record_ids, max_shifts=max_shifts,
+                    employee_stores=employee_stores, employee_hours=employee_hours,
+                    store_ids=store_ids, hour_ids=hour_ids)
+    for name, values in sections.items():
+        raw = values if isinstance(values, bytes) else values.tobytes()
+        data[offsets[name]:offsets[name] + len(raw)] = raw
+    for section, keys, masks in (("store_bits", stores, index.store_masks), ("hour_bits", hours, index.hour_masks)):
+        for k, key in enumerate(keys):
+            start = offsets[section] + k * row_bytes
+            data[start:start + row_bytes] = masks.get(key, 0).to_bytes(row_bytes, "little")
+
+    # Write to a temporary file and rename so readers never map half a file
+    snapshot_path = snapshot_path_for(path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(snapshot_path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, snapshot_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return False  # A read-only directory just means every load parses the JSON
+    return True
+
+
+class RosterSnapshot:
+    """Read-only memory-mapped snapshot; columns are views into the mapping."""
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except (ValueError, struct.error):
+            self.close()
+            raise ValueError(f"{path} is not a roster snapshot")
+
+    def _open(self):
+        fields = HEADER.unpack_from(self._map)
+        magic, version = fields[:2]
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Unknown snapshot format")
+        self.key = _key_from(fields)
+        count, _, store_count, hour_count, string_bytes = fields[7:]
+        offsets, self._row_bytes, size = _layout(count, store_count, hour_count, string_bytes)
+        if len(self._map) < size:
+            raise ValueError("Truncated snapshot")
+        self._count = count
+        self._offsets = offsets
+        self._view = memoryview(self._map)
+        start = offsets["strings"]
+        self.strings = str(self._view[start:start + string_bytes], "utf-8").split("\0")
+
+        def column(name, code, length):
+            start = offsets[name]
+            return self._view[start:start + length * array(code).itemsize].cast(code)
+
+        self.name_ids = column("name_ids", "I", count)
+        self.collab_ids = column("collab_ids", "I", count)
+        self.extra_ids = column("extra_ids", "I", count)
+        self.record_ids = column("record_ids", "i", count)
+        self.max_shifts = column("max_shifts", "H", count)
+        self.employee_stores = column("employee_stores", "Q", count)
+        self.employee_hours = column("employee_hours", "Q", count)
+        self.stores = [self.strings[i] for i in column("store_ids", "I", store_count)]
+        self.hours = [self.strings[i] for i in column("hour_ids", "I", hour_count)]
+
+    def __len__(self):
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # Views must be released before the mapping can be closed
+        for name in ("name_ids", "collab_ids", "extra_ids", "record_ids", "max_shifts",
+                     "employee_stores", "employee_hours", "_view"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+
+    def _masks(self, section, keys):
+        start = self._offsets[section]
+        row_bytes = self._row_bytes
+        masks = {}
+        for k, key in enumerate(keys):
+            mask = int.from_bytes(self._view[start + k * row_bytes:start + (k + 1) * row_bytes], "little")
+            if mask:
+                masks[key] = mask
+        return masks
+
+    def store_masks(self):
+        """Return {store: bitmask over employees}, read straight from the mapping."""
+        return self._masks("store_bits", self.stores)
+
+    def hour_masks(self):
+        """Return {"AM SUN": bitmask over employees}, read straight from the mapping."""
+        return self._masks("hour_bits", self.hours)
+
+    def roster(self):
+        """Decode every record and return a Roster whose availability index is already built."""
+        strings = self.strings
+        stores_of = _key_decoder(self.stores)
+        hours_of = _key_decoder(self.hours)
+        records = []
+        for name_id, store_bits, hour_bits, collab_id, extra_id, record_id, cap in zip(
+                self.name_ids, self.employee_stores, self.employee_hours, self.collab_ids, self.extra_ids,
+                self.record_ids, self.max_shifts):
+            record = {"name": strings[name_id], "stores": stores_of(store_bits), "hours": hours_of(hour_bits)}
+            if collab_id != NONE:
+                record["collab"] = strings[collab_id]
+            if cap:
+                record["max_shifts"] = cap
+            if extra_id != NONE:
+                record.update(json.loads(strings[extra_id]))
+            if record_id >= 0:
+                record["id"] = record_id
+            records.append(record)
+        return Roster(records, AvailabilityIndex.from_masks(records, self.store_masks(), self.hour_masks()))
+
+
+_loaded = None  # (snapshot path, key, Roster) most recently loaded through a snapshot in this process
+
+
+def load_roster(path, key):
+    """Return the Roster for the employee file at path, read at stat key ``key``.
+
+    Uses the snapshot when it is current; otherwise parses the JSON Lines
+    file and rewrites the snapshot.
+    """
+    global _loaded
+    snapshot_path = snapshot_path_for(path)
+    try:
+        with RosterSnapshot(snapshot_path) as snapshot:
+            if snapshot.key == key:
+                roster = snapshot.roster()
+                _loaded = (snapshot_path, key, roster)
+                return roster
+    except (OSError, ValueError):
+        pass
+    roster = Roster(list(iter_records(path)))
+    if roster.employees and write_snapshot(path, roster, key):
+        _loaded = (snapshot_path, key, roster)
+    return roster
+
+
+class SnapshotRef:
+    """Picklable stand-in for employees of a snapshot, resolved in the worker process."""
+
+    def __init__(self, path, source, key, mask):
+        self.path = path      # The pinned link to open
+        self.source = source  # The snapshot it was pinned from
+        self.key = key
+        self.mask = mask
+
+    def open(self):
+        """Return (index, employees): the snapshot's index and the referenced records."""
+        global _loaded
+        if _loaded is None or _loaded[:2] != (self.source, self.key):
+            try:
+                with RosterSnapshot(self.path) as snapshot:
+                    if snapshot.key != self.key:
+                        raise ValueError("stale")
+                    _loaded = (self.source, self.key, snapshot.roster())
+            except (OSError, ValueError):
+                raise RuntimeError(f"The roster snapshot {self.path} was removed before the job ran")
+        index = _loaded[2].index
+        return index, index.members(self.mask)
+
+
+_pins = {}  # (snapshot path, key) -> [pinned link, SnapshotRefs not yet released]
+_pins_lock = threading.Lock()
+_pin_serial = itertools.count()
+
+
+def _pin(path, key):
+    """Return a hard link to the snapshot at path, taken at key, or None if there is none."""
+    with _pins_lock:
+        pin = _pins.get((path, key))
+        if pin is None:
+            pinned = f"{path}.{os.getpid()}-{next(_pin_serial)}"
+            try:
+                os.link(path, pinned)
+            except OSError:
+                return None
+            if read_key(pinned) != key:
+                # The snapshot was rewritten after this process loaded it
+                try:
+                    os.remove(pinned)
+                except OSError:
+                    pass
+                return None
+            pin = _pins[path, key] = [pinned, 0]
+        pin[1] += 1
+        return pin[0]
+
+
+def share(employees):
+    """Return a SnapshotRef for employees if they all belong to this process's snapshot roster.
+
+    The ref holds a pinned copy of the snapshot until release() is called
+    for it, so edits made while the job waits do not affect it. Otherwise
+    (no snapshot, records from elsewhere, or no hard links) employees is
+    returned unchanged and is pickled as before.
+    """
+    if _loaded is None:
+        return employees
+    path, key, roster = _loaded
+    index = roster.index
+    positions = []
+    for emp in employees:
+        i = index.positions.get(emp["name"])
+        if i is None or index.employees[i] is not emp:
+            return employees
+        positions.append(i)
+    pinned = _pin(path, key)
+    if pinned is None:
+        return employees
+    return SnapshotRef(pinned, path, key, mask_from_positions(positions, len(index)))
+
+
+def release(shared):
+    """Drop the hold a share() result has on its pinned snapshot; the last one removes the link."""
+    if not isinstance(shared, SnapshotRef):
+        return
+    with _pins_lock:
+        pin = _pins.get((shared.source, shared.key))
+        if pin is None:
+            return
+        pin[1] -= 1
+        if pin[1] == 0:
+            del _pins[shared.source, shared.key]
+            try:
+                os.remove(pin[0])
+            except OSError:
+                pass  # Still mapped by a worker on Windows; it is only a stale copy
+
+
+def resolve(employees):
+    """Return (index or None, employees) for what share() produced."""
+    if isinstance(employees, SnapshotRef):
+        return employees.open()
+    return None, employees
\ No newline at end of file
@@ -0,0 +1,174 @@
+# schedule_cache.py
+#
+# Content-addressed cache of generated schedules. A schedule is keyed by a
+# hash of everything that determines it: the normalized roster records, the
+# selected names, the store/day/shift lists and the solver constraints
+# (including the seed). Results live in a small in-memory LRU and in a
+# size-bounded directory of JSON files, so re-opening a schedule for an
+# unchanged roster skips the solver entirely.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from constants import SCHEDULE_CACHE_DIR
+from schedule_grid import Schedule
+from solver import Constraints, solve
+
+MEMORY_ITEMS = 32              # Schedules kept in memory
+DISK_BYTES = 64 * 1024 * 1024  # Total size of the on-disk tier
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def normalize_record(record):
+    """Return a record with list fields sorted, so equivalent records hash alike."""
+    return {key: sorted(value) if isinstance(value, list) else value for key, value in record.items()}
+
+
+def roster_fingerprint(employees):
+    """Hash the normalized records in roster order (order decides solver positions)."""
+    digest = hashlib.sha256()
+    for record in employees:
+        digest.update(_canonical(normalize_record(record)).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def fingerprint(roster_hash, selected, stores, days, shifts, constraints):
+    """Return the cache key for one solve."""
+    return hashlib.sha256(_canonical({
+        "roster": roster_hash,
+        "selected": sorted(selected),
+        "stores": list(stores),
+        "days": list(days),
+        "shifts": list(shifts),
+        "constraints": vars(constraints),
+    }).encode("utf-8")).hexdigest()
+
+
+class ScheduleCache:
+    """Two-tier schedule cache: an in-memory LRU in front of a directory of files."""
+
+    def __init__(self, directory=SCHEDULE_CACHE_DIR, memory_items=MEMORY_ITEMS, disk_bytes=DISK_BYTES):
+        self.directory = directory
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()  # Key -> Schedule, least recently used first
+        self._lock = threading.Lock()  # Solves may run on worker threads
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Return a copy of the cached Schedule for key, or None."""
+        with self._lock:
+            schedule = self._memory.get(key)
+            if schedule is not None:
+                self._memory.move_to_end(key)
+                return schedule.copy()
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r") as file:
+                schedule = Schedule.from_state(json.load(file))
+            os.utime(path)  # Mark as recently used for eviction
+        except (OSError, ValueError, KeyError):
+            return None
+        self._remember(key, schedule)
+        return schedule.copy()
+
+    def put(self, key, schedule):
+        """Store a copy of schedule in both tiers."""
+        schedule = schedule.copy()
+        self._remember(key, schedule)
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to a temporary file and rename so readers never see half a file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(schedule.to_state(), file, separators=(",", ":"))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._evict()
+
+    def clear(self):
+        """Drop every cached schedule from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                os.unlink(entry.path)
+
+    def _remember(self, key, schedule):
+        with self._lock:
+            self._memory[key] = schedule
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def _evict(self):
+        """Delete the least recently used files until the directory fits disk_bytes."""
+        entries = [
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(self.directory) if entry.name.endswith(".json")
+        ]
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def cache_key(roster, employees, stores, days, shifts, constraints=None):
+    """Return (key, constraints) for a solve, seeding the constraints from the inputs if unseeded."""
+    if constraints is None:
+        constraints = Constraints()
+    selected = [emp["name"] for emp in employees]
+    if constraints.seed is None:
+        unseeded = fingerprint(roster.fingerprint, selected, stores, days, shifts, constraints)
+        constraints = constraints.with_seed(int(unseeded[:8], 16))
+    return fingerprint(roster.fingerprint, selected, stores, days, shifts, constraints), constraints
+
+
+def solve_cached(cache, roster, employees, stores, days, shifts, constraints=None, **solve_args):
+    """solve() through the cache; returns (schedule, hit).
+
+    ``roster`` is the Roster that ``employees`` were selected from. Without a
+    seed in ``constraints`` the seed is derived from the inputs, so the same
+    roster and selection always give the same schedule. Extra keyword
+    arguments (index, progress, cancel) are passed on to solve().
+    """
+    key, constraints = cache_key(roster, employees, stores, days, shifts, constraints)
+    schedule = cache.get(key)
+    if schedule is not None:
+        return schedule, True
+    schedule = solve(employees, stores, days, shifts, constraints, **solve_args)
+    cache.put(key, schedule)
+    return schedule, False
+
+
+_schedule_cache = None
+
+
+def get_schedule_cache():
+    """Return the shared ScheduleCache, stored in SCHEDULE_CACHE_DIR."""
+    global _schedule_cache
+    if _schedule_cache is None:
+        _schedule_cache = ScheduleCache(SCHEDULE_CACHE_DIR)
+    return _schedule_cache
\ No newline at end of file
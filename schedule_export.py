@@ -0,0 +1,236 @@
+# schedule_export.py
+#
+# Streaming schedule exporters. Each exporter is fed one week at a time with
+# write_week(week_start, schedule) and writes it out immediately, so a
+# many-month, many-store export never holds more than one week in memory.
+# The XLSX writer is pure Python (zipfile + hand-written SpreadsheetML).
+
+import csv
+import datetime
+import json
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape
+from constants import SHIFT_TIMES
+from profiling import phase
+
+FORMATS = ("csv", "json", "xlsx", "ics")
+COLUMNS = ["week_start", "date", "day", "shift", "store", "position", "employee"]
+
+
+def next_week_start(today=None):
+    """Return the date of the coming Sunday (today if it is Sunday)."""
+    today = today or datetime.date.today()
+    return today + datetime.timedelta(days=(6 - today.weekday()) % 7)
+
+
+def iter_rows(week_start, schedule):
+    """Yield one COLUMNS row per assigned employee, in day/shift/store order."""
+    for (day, shift, store), names in schedule.iter_cells():
+        date = week_start + datetime.timedelta(days=schedule.days.index(day))
+        for position, name in enumerate(names, start=1):
+            yield [week_start.isoformat(), date.isoformat(), day, shift, store, position, name]
+
+
+class Exporter:
+    """Base class: use as a context manager and call write_week() per week."""
+
+    def write_week(self, week_start, schedule):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvExporter(Exporter):
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(COLUMNS)
+
+    def write_week(self, week_start, schedule):
+        self.writer.writerows(iter_rows(week_start, schedule))
+
+    def close(self):
+        self.file.close()
+
+
+class JsonExporter(Exporter):
+    """Writes {"weeks": [{"week_start": ..., "seed": ..., "slots": [...]}, ...]} piece by piece."""
+
+    def __init__(self, path):
+        self.file = open(path, "w")
+        self.file.write('{"weeks": [')
+        self.first_week = True
+
+    def write_week(self, week_start, schedule):
+        self.file.write("\n" if self.first_week else ",\n")
+        self.first_week = False
+        self.file.write(f'{{"week_start": "{week_start.isoformat()}", "seed": {json.dumps(schedule.seed)}, "slots": [')
+        for i, ((day, shift, store), names) in enumerate(schedule.iter_cells()):
+            slot = {"day": day, "shift": shift, "store": store, "employees": list(names)}
+            self.file.write(("\n  " if i == 0 else ",\n  ") + json.dumps(slot))
+        self.file.write("]}")
+
+    def close(self):
+        self.file.write("\n]}\n")
+        self.file.close()
+
+
+XLSX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+XLSX_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+XLSX_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Schedule" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+XLSX_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>"""
+
+
+class XlsxExporter(Exporter):
+    """Single-sheet workbook with inline strings, streamed into the zip entry."""
+
+    def __init__(self, path):
+        self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+        self.zip.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES)
+        self.zip.writestr("_rels/.rels", XLSX_ROOT_RELS)
+        self.zip.writestr("xl/workbook.xml", XLSX_WORKBOOK)
+        self.zip.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS)
+        self.sheet = self.zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self.sheet.write(
+            b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+        )
+        self.row = 0
+        self.write_row(COLUMNS)
+
+    def write_row(self, values):
+        self.row += 1
+        cells = []
+        for value in values:
+            if isinstance(value, int):
+                cells.append(f"<c><v>{value}</v></c>")
+            else:
+                cells.append(f'<c t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+        self.sheet.write(f'<row r="{self.row}">{"".join(cells)}</row>'.encode("utf-8"))
+
+    def write_week(self, week_start, schedule):
+        for row in iter_rows(week_start, schedule):
+            self.write_row(row)
+
+    def close(self):
+        self.sheet.write(b"</sheetData></worksheet>")
+        self.sheet.close()
+        self.zip.close()
+
+
+def _ics_text(value):
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+
+
+def _ics_line(line):
+    """Return one content line with its CRLF, folded at 75 octets as RFC 5545 requires."""
+    data = line.encode("utf-8")
+    parts = []
+    start, limit = 0, 75
+    while len(data) - start > limit:
+        end = start + limit
+        while data[end] & 0xC0 == 0x80:
+            end -= 1  # Never split a UTF-8 sequence
+        parts.append(data[start:end].decode("utf-8"))
+        start, limit = end, 74  # Continuation lines begin with a space
+    parts.append(data[start:].decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+class IcsExporter(Exporter):
+    """One iCalendar file per employee in a directory, appended to week by week."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.paths = {}  # Employee name -> .ics path already started
+        self.used = set()  # Lower-cased file names taken, since names can sanitize alike
+
+    def path_for(self, name):
+        path = self.paths.get(name)
+        if path is None:
+            base = re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_") or "employee"
+            filename, n = base, 1
+            while filename.lower() in self.used:
+                n += 1
+                filename = f"{base}_{n}"
+            self.used.add(filename.lower())
+            path = self.paths[name] = os.path.join(self.directory, f"{filename}.ics")
+            with open(path, "w", newline="") as file:
+                file.write(_ics_line("BEGIN:VCALENDAR") + _ics_line("VERSION:2.0")
+                           + _ics_line("PRODID:-//schedule_gen//EN"))
+        return path
+
+    def write_week(self, week_start, schedule):
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        events = {}
+        for (day, shift, store), names in schedule.iter_cells():
+            date = week_start + datetime.timedelta(days=schedule.days.index(day))
+            start, end = SHIFT_TIMES.get(shift, ("00:00", "23:59"))
+            for name in names:
+                events.setdefault(name, []).append("".join(map(_ics_line, (
+                    "BEGIN:VEVENT",
+                    f"UID:{date:%Y%m%d}-{shift}-{_ics_text(store)}-{_ics_text(name)}@schedule_gen",
+                    f"DTSTAMP:{stamp}",
+                    f"DTSTART:{date:%Y%m%d}T{start.replace(':', '')}00",
+                    f"DTEND:{date:%Y%m%d}T{end.replace(':', '')}00",
+                    f"SUMMARY:{_ics_text(f'{shift} shift at {store}')}",
+                    f"LOCATION:{_ics_text(store)}",
+                    "END:VEVENT",
+                ))))
+        for name, lines in events.items():
+            with open(self.path_for(name), "a", newline="") as file:
+                file.writelines(lines)
+
+    def close(self):
+        for path in self.paths.values():
+            with open(path, "a", newline="") as file:
+                file.write(_ics_line("END:VCALENDAR"))
+
+
+EXPORTERS = {
+    "csv": CsvExporter,
+    "json": JsonExporter,
+    "xlsx": XlsxExporter,
+    "ics": IcsExporter,
+}
+
+
+def open_exporter(fmt, target):
+    """Return an exporter for fmt writing to target (a directory for "ics")."""
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return EXPORTERS[fmt](target)
+
+
+def export_schedule(schedule, fmt, target, week_start=None):
+    """Export a single week; week_start defaults to the coming Sunday."""
+    with phase(f"export_{fmt}"), open_exporter(fmt, target) as exporter:
+        exporter.write_week(week_start or next_week_start(), schedule)
\ No newline at end of file
@@ -2,12 +2,18 @@
 
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import messagebox
-from collections import defaultdict
-import random
-import json
-from utils import read_employees
-from constants import STORES, DAYS, SHIFTS
+from tkinter import filedialog, messagebox
+import queue
+import threading
+import profiling
+from roster import get_employee_store, get_roster
+from constants import STORES, DAYS, SHIFTS, SERVICE_URL
+from solver import Constraints, SolveCancelled
+from feasibility import check_feasibility
+from schedule_cache import get_schedule_cache, solve_cached
+from repair import repair_schedule
+from schedule_render import SHIFT_COLORS, render_schedule
+from schedule_export import FORMATS, export_schedule
 import platform  # To handle platform-specific mouse wheel behavior
 
 class ScheduleGenerator(ctk.CTkToplevel):
@@ -19,6 +25,27 @@ class ScheduleGenerator(ctk.CTkToplevel):
 
         # Open in full-screen mode
         self.attributes("-fullscreen", True)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.cancel_event = threading.Event()  # Set to stop a running solve
+
+        # Progress bar and Cancel button, shown while the solver runs
+        self.progress_frame = ctk.CTkFrame(self)
+        self.progress_frame.pack(fill="x", padx=20, pady=(20, 0))
+        self.progress_label = ctk.CTkLabel(self.progress_frame, text="Generating schedule...")
+        self.progress_label.pack(side="left", padx=10, pady=10)
+        self.progress_bar = ctk.CTkProgressBar(self.progress_frame)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(side="left", fill="x", expand=True, padx=10, pady=10)
+        self.cancel_button = ctk.CTkButton(self.progress_frame, text="Cancel", command=self.close)
+        self.cancel_button.pack(side="right", padx=10, pady=10)
+
+        # Export controls, shown once a schedule has been generated
+        self.export_frame = ctk.CTkFrame(self)
+        self.export_format = ctk.StringVar(value=FORMATS[0])
+        self.export_menu = ctk.CTkOptionMenu(self.export_frame, values=list(FORMATS), variable=self.export_format)
+        self.export_menu.pack(side="left", padx=10, pady=10)
+        self.export_button = ctk.CTkButton(self.export_frame, text="Export", command=self.export)
+        self.export_button.pack(side="left", padx=10, pady=10)
 
         # Add a frame to hold the text widget and scrollbars
         self.frame = ctk.CTkFrame(self)
@@ -58,112 +85,135 @@ class ScheduleGenerator(ctk.CTkToplevel):
 
     def generate_schedule(self):
         """Generate a schedule based on employee availability."""
-        employees = read_employees()
-        if not employees:
+        profiling.reset()
+        roster = get_roster()
+        if not roster.employees:
             raise Exception("No employees available to generate a schedule.")
 
         # Filter employees based on selection
-        employees = [emp for emp in employees if emp["name"] in self.selected_employees]
-
-        schedule = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
-        employee_shifts = defaultdict(int)  # Track shifts per employee
-
-        for day in DAYS:
-            for shift in SHIFTS:
-                for store in STORES:
-                    available_employees = [
-                        emp for emp in employees
-                        if store in emp["stores"] and f"{shift} {day[:3].upper()}" in emp["hours"]
-                        and employee_shifts[emp["name"]] < 5  # Limit shifts per employee
-                    ]
-                    selected_employees = random.sample(available_employees, min(3, len(available_employees)))
-                    schedule[day][shift][store] = [emp["name"] for emp in selected_employees]
-                    for emp in selected_employees:
-                        employee_shifts[emp["name"]] += 1
-
-        self.display_schedule(schedule)
+        selected = set(self.selected_employees)
+        employees = [emp for emp in roster.employees if emp["name"] in selected]
+
+        # The roster's availability index is reused until the employee file changes
+        self.index = roster.index
+        self.repair_index = None  # This window's own copy, made on the first repair
+        self.constraints = Constraints()
+
+        # Show coverage gaps right away; the check reads only the index and takes milliseconds
+        report = check_feasibility(employees, STORES, DAYS, SHIFTS, self.constraints, index=self.index)
+        if not report.feasible or report.unpaired:
+            self.feasibility_label = ctk.CTkLabel(self, text="\n".join(report.lines(limit=5)), justify="left",
+                                                  anchor="w")
+            self.feasibility_label.pack(fill="x", padx=20, pady=(10, 0), before=self.frame)
+
+        # Solve on a worker thread; the Tk thread polls for progress and the result
+        self.progress = (0, 1)  # (filled, total), written by the worker
+        self.results = queue.Queue()
+        worker = threading.Thread(target=self.run_solver, args=(roster, employees), daemon=True)
+        worker.start()
+        self.after(50, self.poll_solver)
+
+    def run_solver(self, roster, employees):
+        """Worker thread: run the solver and hand the outcome to the Tk thread."""
+        try:
+            # The same roster and selection reuse the cached schedule instead of solving again
+            with profiling.run("generate", log=False, fresh=False):
+                if SERVICE_URL:
+                    # The service solves (or reuses) the schedule; it does not report progress
+                    schedule, _ = get_employee_store().generate(
+                        [emp["name"] for emp in employees], STORES, self.constraints
+                    )
+                else:
+                    schedule, _ = solve_cached(
+                        get_schedule_cache(), roster, employees, STORES, DAYS, SHIFTS, self.constraints,
+                        index=self.index, progress=self.report_progress, cancel=self.cancel_event
+                    )
+            self.results.put(("done", schedule))
+        except SolveCancelled:
+            self.results.put(("cancelled", None))
+        except Exception as e:
+            self.results.put(("error", e))
+
+    def report_progress(self, filled, total):
+        """Called from the worker thread; only records the numbers."""
+        self.progress = (filled, total)
+
+    def poll_solver(self):
+        """Update the progress bar and pick up the result when the worker finishes."""
+        if not self.winfo_exists():
+            return
+        filled, total = self.progress
+        self.progress_bar.set(filled / total if total else 1)
+        self.progress_label.configure(text=f"Filled {filled} of {total} slots")
+        try:
+            status, result = self.results.get_nowait()
+        except queue.Empty:
+            self.after(50, self.poll_solver)
+            return
+
+        if status == "done":
+            self.schedule = result
+            self.progress_frame.pack_forget()
+            self.export_frame.pack(fill="x", padx=20, pady=(20, 0), before=self.frame)
+            self.display_schedule(self.schedule)
+            if profiling.is_enabled():
+                profiling.write_summary("generate")
+        elif status == "error":
+            messagebox.showerror("Error", f"Failed to generate schedule: {result}")
+            self.destroy()
+        else:
+            self.destroy()
+
+    def close(self):
+        """Stop any running solve and close the window."""
+        self.cancel_event.set()
+        self.destroy()
+
+    def repair_employee(self, old_record, new_record):
+        """Patch the displayed schedule after one employee was edited."""
+        selected = set(self.selected_employees)
+        if self.repair_index is None:
+            # The cached roster's index is shared and read-only; repairs update a copy
+            self.repair_index = self.index.copy()
+        repair_schedule(self.schedule, self.repair_index, old_record, new_record, self.constraints, selected)
+        self.selected_employees = list(selected)
+        self.display_schedule(self.schedule)
+
+    def export(self):
+        """Save the schedule in the chosen format."""
+        fmt = self.export_format.get()
+        if fmt == "ics":
+            target = filedialog.askdirectory(parent=self, title="Folder for the calendar files")
+        else:
+            target = filedialog.asksaveasfilename(
+                parent=self, defaultextension=f".{fmt}", filetypes=[(fmt.upper(), f"*.{fmt}")]
+            )
+        if not target:
+            return
+        try:
+            export_schedule(self.schedule, fmt, target)
+            messagebox.showinfo("Success", f"Schedule exported to {target}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export schedule: {e}")
 
     def display_schedule(self, schedule):
         """Display the generated schedule in the new layout."""
-        # Define column widths
-        store_col_width = 15  # Width for the store column
-        day_col_width = 12    # Width for each day column
-        padding = " " * 2     # Padding between columns
-
-        # Create the header row
-        header1 = f"{'Store':<{store_col_width}}" + padding
-        header1 += f"{'AM':<{day_col_width}}" + padding
-        for day in DAYS:
-            header1 += f"{day[:3].upper():<{day_col_width}}" + padding
-        header1 += "\n"
-
-        header2 = " " * (store_col_width + len(padding))  # Align with "Store"
-        header2 += f"{'PM':<{day_col_width}}" + padding
-        header2 += " " * (day_col_width + len(padding)) * len(DAYS)  # Align with days
-        header2 += "\n"
-
-        separator = "-" * (store_col_width + (day_col_width + len(padding)) * (len(DAYS) + 1)) + "\n"
-
-        schedule_text = header1 + header2 + separator
-
-        # Insert the header into the text widget
-        self.schedule_text.delete("1.0", "end")
-        self.schedule_text.insert("1.0", schedule_text)
-
-        # Highlight only the "AM" and "PM" text in the header
-        am_start = "1." + str(len("Store") + len(padding))  # Start of "AM"
-        am_end = "1." + str(len("Store") + len(padding) + len("AM"))  # End of "AM"
-        self.schedule_text.tag_add("am_shift", am_start, am_end)
-
-        pm_start = "2." + str(len("Store") + len(padding))  # Start of "PM"
-        pm_end = "2." + str(len("Store") + len(padding) + len("PM"))  # End of "PM"
-        self.schedule_text.tag_add("pm_shift", pm_start, pm_end)
-
-        for store in STORES:
-            # Store name row
-            store_row = f"{store:<{store_col_width}}" + padding
-            self.schedule_text.insert("end", store_row + "\n")
-
-            # AM and PM shifts for each day
-            for shift in SHIFTS:
-                shift_row = " " * (store_col_width + len(padding))  # Align with "Store"
-                shift_row += f"{shift}: "  # Add shift label (AM/PM)
-                for day in DAYS:
-                    employees = schedule.get(day, {}).get(shift, {}).get(store, [])
-                    if employees:
-                        # Display each employee on a new line under the respective day
-                        for emp in employees:
-                            shift_row += f"{emp:<{day_col_width}}" + padding
-                        shift_row += "\n" + " " * (store_col_width + len(padding) + len("AM: "))  # Align next employee
-                    else:
-                        # Leave the spot empty if no employees are available
-                        shift_row += f"{' ':<{day_col_width}}" + padding
-                self.schedule_text.insert("end", shift_row + "\n")
-            self.schedule_text.insert("end", "\n")  # Extra spacing between stores
+        # Build the whole layout in one pass, then insert it with a single call
+        text, spans = render_schedule(schedule, STORES, DAYS, SHIFTS)
+        with profiling.phase("display"):
+            self.schedule_text.delete("1.0", "end")
+            self.schedule_text.insert("1.0", text)
 
         # Add color coding for AM and PM shifts in the schedule
-        self.color_code_shifts()
+        self.color_code_shifts(spans)
 
-    def color_code_shifts(self):
+    @profiling.profiled("color_code")
+    def color_code_shifts(self, spans):
         """Apply background colors to AM and PM shifts for better readability."""
-        self.schedule_text.tag_configure("am_shift", background="#D6EAF8")  # Light blue for AM
-        self.schedule_text.tag_configure("pm_shift", background="#FADBD8")  # Light red for PM
-
-        # Apply tags to AM and PM rows
-        start_index = "1.0"
-        while True:
-            # Find the next AM row
-            am_start = self.schedule_text.search("AM:", start_index, stopindex="end")
-            if not am_start:
-                break
-            am_end = f"{am_start} lineend"
-            self.schedule_text.tag_add("am_shift", am_start, am_end)
-
-            # Find the next PM row
-            pm_start = self.schedule_text.search("PM:", start_index, stopindex="end")
-            if not pm_start:
-                break
-            pm_end = f"{pm_start} lineend"
-            self.schedule_text.tag_add("pm_shift", pm_start, pm_end)
-
-            start_index = pm_end
\ No newline at end of file
+        for tag, color in SHIFT_COLORS.items():
+            self.schedule_text.tag_configure(tag, background=color)
+
+        # Tag every recorded range of a shift in one tag_add call
+        for tag, indices in spans.items():
+            if indices:
+                self.schedule_text.tag_add(tag, *indices)
\ No newline at end of file
@@ -0,0 +1,191 @@
+# schedule_grid.py
+#
+# Compact schedule storage. Days, shifts and stores map to small integer
+# positions and employees are interned to integer ids, so a whole week is one
+# flat array of (day x shift x store x position) employee ids plus a
+# per-employee index of the cells they work.
+
+from array import array
+
+EMPTY = -1
+
+
+class Schedule:
+    """Employee assignments for every (day, shift, store) slot."""
+
+    def __init__(self, days, shifts, stores, slot_size=3):
+        self.days = list(days)
+        self.shifts = list(shifts)
+        self.stores = list(stores)
+        self.slot_size = slot_size  # Positions per slot
+        self.stats = {}             # Coverage and quality figures from scoring.evaluate
+        self.seed = None            # Seed that reproduces this schedule
+
+        self._day_ids = {day: i for i, day in enumerate(self.days)}
+        self._shift_ids = {shift: i for i, shift in enumerate(self.shifts)}
+        self._store_ids = {store: i for i, store in enumerate(self.stores)}
+        cell_count = len(self.days) * len(self.shifts) * len(self.stores)
+        self.slots = array("i", [EMPTY]) * (cell_count * slot_size)  # Employee id per position
+        self.sizes = array("B", [0]) * cell_count                    # Filled positions per cell
+
+        self.names = []     # Employee id -> name
+        self.name_ids = {}  # Employee name -> id
+        self._where = []    # Employee id -> set of cell numbers they work
+
+    # -- ids ---------------------------------------------------------------
+
+    def _cell(self, day, shift, store):
+        return (self._day_ids[day] * len(self.shifts) + self._shift_ids[shift]) * len(self.stores) + self._store_ids[store]
+
+    def _key(self, cell):
+        rest, store = divmod(cell, len(self.stores))
+        day, shift = divmod(rest, len(self.shifts))
+        return self.days[day], self.shifts[shift], self.stores[store]
+
+    def _intern(self, name):
+        employee_id = self.name_ids.get(name)
+        if employee_id is None:
+            employee_id = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+            self._where.append(set())
+        return employee_id
+
+    # -- editing -----------------------------------------------------------
+
+    def assign(self, day, shift, store, names):
+        """Set the employees working a slot, replacing anyone assigned before."""
+        cell = self._cell(day, shift, store)
+        self._clear(cell)
+        for name in names:
+            self._add(cell, name)
+
+    def add(self, day, shift, store, name):
+        """Add one employee to a slot."""
+        self._add(self._cell(day, shift, store), name)
+
+    def remove(self, day, shift, store, name):
+        """Take one employee off a slot."""
+        cell = self._cell(day, shift, store)
+        employee_id = self.name_ids[name]
+        start, size = cell * self.slot_size, self.sizes[cell]
+        ids = [i for i in self.slots[start:start + size] if i != employee_id]
+        self.slots[start:start + self.slot_size] = array("i", ids + [EMPTY] * (self.slot_size - len(ids)))
+        self.sizes[cell] = len(ids)
+        self._where[employee_id].discard(cell)
+
+    def _add(self, cell, name):
+        size = self.sizes[cell]
+        if size >= self.slot_size:
+            raise ValueError(f"Slot {self._key(cell)} already has {self.slot_size} employees")
+        employee_id = self._intern(name)
+        self.slots[cell * self.slot_size + size] = employee_id
+        self.sizes[cell] = size + 1
+        self._where[employee_id].add(cell)
+
+    def _clear(self, cell):
+        start = cell * self.slot_size
+        for employee_id in self.slots[start:start + self.sizes[cell]]:
+            self._where[employee_id].discard(cell)
+            self.slots[start] = EMPTY
+            start += 1
+        self.sizes[cell] = 0
+
+    # -- queries -----------------------------------------------------------
+
+    def get(self, day, shift, store):
+        """Return the employees working a slot (empty tuple if none)."""
+        cell = self._cell(day, shift, store)
+        start = cell * self.slot_size
+        return tuple(self.names[i] for i in self.slots[start:start + self.sizes[cell]])
+
+    def iter_cells(self):
+        """Yield ((day, shift, store), names) for every slot with someone in it."""
+        for cell, size in enumerate(self.sizes):
+            if size:
+                start = cell * self.slot_size
+                yield self._key(cell), tuple(self.names[i] for i in self.slots[start:start + size])
+
+    def filled(self):
+        """Return the number of filled positions."""
+        return sum(self.sizes)
+
+    def slots_of(self, name):
+        """Return the (day, shift, store) slots an employee works."""
+        employee_id = self.name_ids.get(name)
+        if employee_id is None:
+            return set()
+        return {self._key(cell) for cell in self._where[employee_id]}
+
+    def count_of(self, name):
+        """Return how many shifts an employee works."""
+        employee_id = self.name_ids.get(name)
+        return 0 if employee_id is None else len(self._where[employee_id])
+
+    @property
+    def shift_counts(self):
+        """Dict of employee name -> number of assigned shifts (employees with none omitted)."""
+        return {name: len(cells) for name, cells in zip(self.names, self._where) if cells}
+
+    # -- copy, diff, serialization -----------------------------------------
+
+    def copy(self):
+        """Return an independent copy."""
+        other = Schedule.__new__(Schedule)
+        other.__dict__.update(self.__dict__)
+        other.stats = dict(self.stats)
+        other.slots = array("i", self.slots)
+        other.sizes = array("B", self.sizes)
+        other.names = list(self.names)
+        other.name_ids = dict(self.name_ids)
+        other._where = [set(cells) for cells in self._where]
+        return other
+
+    def diff(self, other):
+        """Return [((day, shift, store), removed, added)] for the slots that changed since other."""
+        changes = []
+        for day in self.days:
+            for shift in self.shifts:
+                for store in self.stores:
+                    mine, theirs = set(self.get(day, shift, store)), set(other.get(day, shift, store))
+                    if mine != theirs:
+                        changes.append(((day, shift, store), sorted(theirs - mine), sorted(mine - theirs)))
+        return changes
+
+    def as_dict(self):
+        """Return the schedule as nested plain dicts: day -> shift -> store -> names."""
+        return {
+            day: {
+                shift: {store: list(self.get(day, shift, store)) for store in self.stores}
+                for shift in self.shifts
+            }
+            for day in self.days
+        }
+
+    def to_state(self):
+        """Return a compact JSON-serializable representation."""
+        return {
+            "days": self.days,
+            "shifts": self.shifts,
+            "stores": self.stores,
+            "slot_size": self.slot_size,
+            "names": self.names,
+            "slots": self.slots.tolist(),
+            "seed": self.seed,
+            "stats": self.stats,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a Schedule from to_state() output."""
+        schedule = cls(state["days"], state["shifts"], state["stores"], state["slot_size"])
+        schedule.seed = state.get("seed")
+        schedule.stats = state.get("stats", {})
+        for name in state["names"]:
+            schedule._intern(name)
+        slot_size = schedule.slot_size
+        slots = state["slots"]
+        for cell in range(len(schedule.sizes)):
+            for employee_id in slots[cell * slot_size:(cell + 1) * slot_size]:
+                if employee_id != EMPTY:
+                    schedule._add(cell, schedule.names[employee_id])
+        return schedule
\ No newline at end of file
@@ -0,0 +1,84 @@
+# schedule_render.py
+#
+# Builds the text layout shown by ScheduleGenerator in a single pass. The
+# tag ranges for the shift rows are recorded while the text is written, so
+# the widget needs one insert and one batched tag_add per tag. Nothing here
+# imports tkinter; the output can also be rendered headlessly.
+
+from constants import CATALOG
+from profiling import profiled
+from slots import slot_table
+
+STORE_COL_WIDTH = 15  # Width for the store column
+DAY_COL_WIDTH = 12    # Width for each day column
+PADDING = " " * 2     # Padding between columns
+
+
+def shift_tag(shift):
+    """Return the Text tag name used for a shift's rows, e.g. "am_shift"."""
+    return f"{shift.lower()}_shift"
+
+
+SHIFT_COLORS = {
+    "am_shift": "#D6EAF8",  # Light blue for AM
+    "pm_shift": "#FADBD8",  # Light red for PM
+}
+# Colors for any other shifts come from the config file
+SHIFT_COLORS.update({shift_tag(shift): color for shift, color in CATALOG["shift_colors"].items()})
+
+
+@profiled("render")
+def render_schedule(schedule, stores, days, shifts):
+    """Return (text, spans) for a schedule.
+
+    ``spans`` maps a tag name to a flat list of Tk Text indices
+    [start1, end1, start2, end2, ...] ready for ``tag_add(tag, *indices)``.
+    """
+    indent = " " * (STORE_COL_WIDTH + len(PADDING))  # Align with "Store"
+    day_cell = DAY_COL_WIDTH + len(PADDING)
+    day_codes = slot_table(stores, days, shifts).day_codes
+    parts = []
+    spans = {}
+
+    # Header: the first two shift names label the two header rows
+    header_shifts = (list(shifts) + ["", ""])[:2]
+    parts.append(f"{'Store':<{STORE_COL_WIDTH}}" + PADDING)
+    parts.append(f"{header_shifts[0]:<{DAY_COL_WIDTH}}" + PADDING)
+    parts.extend(f"{code:<{DAY_COL_WIDTH}}" + PADDING for code in day_codes)
+    parts.append("\n")
+    parts.append(indent + f"{header_shifts[1]:<{DAY_COL_WIDTH}}" + PADDING + " " * day_cell * len(days) + "\n")
+    parts.append("-" * (STORE_COL_WIDTH + day_cell * (len(days) + 1)) + "\n")
+    for line, shift in enumerate(header_shifts, start=1):
+        if shift:
+            col = len(indent)
+            spans.setdefault(shift_tag(shift), []).extend((f"{line}.{col}", f"{line}.{col + len(shift)}"))
+
+    line = 4  # Next line number to be written
+    for store in stores:
+        # Store name row
+        parts.append(f"{store:<{STORE_COL_WIDTH}}" + PADDING + "\n")
+        line += 1
+
+        for shift in shifts:
+            label = f"{shift}: "
+            continuation = "\n" + indent + " " * len(label)  # Align next employee
+            row = [indent, label]
+            for day in days:
+                employees = schedule.get(day, shift, store)
+                if employees:
+                    # Display each employee on a new line under the respective day
+                    row.extend(f"{emp:<{DAY_COL_WIDTH}}" + PADDING for emp in employees)
+                    row.append(continuation)
+                else:
+                    # Leave the spot empty if no employees are available
+                    row.append(f"{' ':<{DAY_COL_WIDTH}}" + PADDING)
+            row.append("\n")
+            spans.setdefault(shift_tag(shift), []).extend((f"{line}.{len(indent)}", f"{line}.0 lineend"))
+            row_text = "".join(row)
+            parts.append(row_text)
+            line += row_text.count("\n")
+
+        parts.append("\n")  # Extra spacing between stores
+        line += 1
+
+    return "".join(parts), spans
\ No newline at end of file
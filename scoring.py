@@ -0,0 +1,65 @@
+# scoring.py
+#
+# Quality measures used to compare schedules produced by different solve
+# modes on the same roster.
+
+from availability import CollabIndex
+from slots import slot_table
+
+IMBALANCE_PENALTY = 1.0  # Score lost per unit of shift-count standard deviation
+COLLAB_BONUS = 5.0       # Score gained when every collaborator preference is met
+
+
+def evaluate(schedule, employees, constraints, collab=None):
+    """Return coverage and quality figures for a schedule.
+
+    The score is the coverage percentage minus a penalty for uneven shift
+    counts across the employees that took part in the solve, plus a bonus for
+    the share of shifts worked alongside the employee's chosen collaborator
+    (the ``collab`` field). A fully covered, perfectly balanced schedule
+    scores 100 before that bonus. ``collab`` may be a CollabIndex built for
+    a larger roster (e.g. ``index.collab``) so it is not rebuilt per solve.
+    """
+    demand = slot_table(schedule.stores, schedule.days, schedule.shifts, constraints).demand
+    filled = schedule.filled()
+
+    counts = [schedule.count_of(emp["name"]) for emp in employees]
+    if counts:
+        mean = sum(counts) / len(counts)
+        imbalance = (sum((c - mean) ** 2 for c in counts) / len(counts)) ** 0.5
+    else:
+        imbalance = 0.0
+
+    collab_shifts, collab_paired = collab_pairing(schedule, employees, collab)
+    collab_rate = collab_paired / collab_shifts if collab_shifts else 0.0
+
+    coverage = filled / demand if demand else 1.0
+    return {
+        "filled": filled,
+        "demand": demand,
+        "coverage": coverage,
+        "imbalance": imbalance,
+        "collab_rate": collab_rate,
+        "score": 100.0 * coverage - IMBALANCE_PENALTY * imbalance + COLLAB_BONUS * collab_rate,
+    }
+
+
+def collab_pairing(schedule, employees, collab=None):
+    """Return (shifts worked by employees with a collaborator, shifts shared with them)."""
+    if collab is None:
+        collab = CollabIndex(employees)
+    if not collab:
+        return 0, 0
+    partners = collab.partners
+    shifts = paired = 0
+    for _, names in schedule.iter_cells():
+        if len(names) < 2:
+            shifts += sum(1 for name in names if name in partners)
+            continue
+        working = set(names)
+        for name in names:
+            if name in partners:
+                shifts += 1
+                if collab.paired(name, working):
+                    paired += 1
+    return shifts, paired
\ No newline at end of file
@@ -0,0 +1,474 @@
+# service.py
+#
+# Local schedule service. One process keeps the indexed roster in memory and
+# serves roster edits, the saved selection, schedule generation and export
+# as a JSON API over HTTP, so every store terminal shares one roster instead
+# of editing its own employee.json:
+#
+#   python service.py --port 8765 --workers 4
+#   SCHEDULE_GEN_SERVICE=http://127.0.0.1:8765 python main.py
+#
+# Routes (JSON in, JSON out):
+#   GET    /health             counters and the number of solves in progress
+#   GET    /version            roster fingerprint; changes with every edit
+#   GET    /employees          every employee record
+#   POST   /employees          add one record, or a list of records in one write
+#   PUT    /employees          replace the whole roster
+#   PUT    /employees/<name>   replace one employee's record
+#   DELETE /employees/<name>   remove an employee
+#   GET    /selection          the saved {name: bool} selection
+#   PUT    /selection          replace the saved selection
+#   POST   /generate           {"stores", "selected", "mode", "seed", ...} -> schedule
+#   POST   /export             the same plus "format" and "week_start" -> the file
+#
+# Roster reads and writes all run on one thread, so edits from different
+# terminals are applied one at a time. Solves run in a process pool. A
+# generate request for a schedule that is already being solved waits for
+# that solve instead of starting another, and once max_pending different
+# solves are queued new ones get 503 with a Retry-After header.
+
+import argparse
+import asyncio
+import datetime
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import traceback
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from constants import DAYS, MAX_HEADCOUNT, SELECTION_FILE, SERVICE_PORT, SERVICE_URL, SHIFTS, STORES
+from roster import (
+    add_employees, delete_employee, get_roster, replace_employees, update_employee, validate_record
+)
+from roster_snapshot import release, resolve, share
+from schedule_cache import ScheduleCache, cache_key
+from slots import slot_table
+from schedule_export import FORMATS, export_schedule
+from solver import Constraints, MODES, solve
+
+MAX_PENDING = 16               # Different solves queued before new ones are refused
+MAX_REQUESTS = 256             # Requests handled at once before new ones are refused
+MAX_BODY = 16 * 1024 * 1024    # Largest accepted request body
+IDLE_TIMEOUT = 30              # Seconds an idle keep-alive connection stays open
+
+STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+EXPORT_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "ics": "application/zip",  # One .ics file per employee, zipped
+}
+
+
+class HttpError(Exception):
+    """An error response: status, message and any extra headers."""
+
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+async def read_request(reader):
+    """Return (method, path, headers, body, version), or None at the end of the stream."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HttpError(411, "Send a Content-Length instead of a chunked body")
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > MAX_BODY:
+        raise HttpError(413, f"Request bodies are limited to {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), urllib.parse.urlsplit(target).path, headers, body, version
+
+
+def encode_response(status, body, content_type, headers, keep_alive):
+    lines = [
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        "Connection: " + ("keep-alive" if keep_alive else "close"),
+    ]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def json_body(value):
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def parse_json(body):
+    try:
+        return json.loads(body) if body else None
+    except ValueError as e:
+        raise HttpError(400, f"Invalid JSON: {e}")
+
+
+def check_record(record):
+    """Raise HttpError unless record is an employee record the roster can use."""
+    if not isinstance(record, dict):
+        raise HttpError(400, "Employee records must be JSON objects")
+    error = validate_record(record)
+    if error:
+        raise HttpError(400, error)
+
+
+def constraints_from(request):
+    """Build Constraints from the options of a generate request; raise HttpError if they are invalid."""
+    if not isinstance(request, dict):
+        raise HttpError(400, "A generate request must be a JSON object")
+    mode = request.get("mode", "random")
+    if mode not in MODES:
+        raise HttpError(400, f"Unknown solve mode: {mode}")
+    options = {key: request[key] for key in ("slot_size", "max_shifts", "seed", "time_budget", "headcount")
+               if request.get(key) is not None}
+    for key in ("slot_size", "max_shifts", "seed"):
+        if key in options and (isinstance(options[key], bool) or not isinstance(options[key], int)):
+            raise HttpError(400, f"'{key}' must be a whole number")
+    if options.get("max_shifts", 1) < 1:
+        raise HttpError(400, "'max_shifts' must be at least 1")
+    if not isinstance(options.get("time_budget", 0), (int, float)):
+        raise HttpError(400, "'time_budget' must be a number of seconds")
+    headcount = options.get("headcount", {})
+    if not isinstance(headcount, dict):
+        raise HttpError(400, "'headcount' must map \"STORE/DAY/SHIFT\" to a number of employees")
+    for what, count in [("slot_size", options.get("slot_size", 0))] + list(headcount.items()):
+        if isinstance(count, bool) or not isinstance(count, int) or not 0 <= count <= MAX_HEADCOUNT:
+            raise HttpError(400, f"{what!r} must be a whole number from 0 to {MAX_HEADCOUNT}")
+    constraints = Constraints(mode=mode, **options)
+    try:
+        slot_table(STORES, DAYS, SHIFTS, constraints)  # Checks the "STORE/DAY/SHIFT" rule patterns
+    except ValueError as e:
+        raise HttpError(400, str(e))
+    return constraints
+
+
+def write_call(func, *args):
+    """Roster thread: run a roster write, turning a taken name into 400 and a missing employee into 404."""
+    try:
+        return func(*args)
+    except ValueError as e:
+        raise HttpError(400, str(e))
+    except KeyError as e:
+        raise HttpError(404, e.args[0] if e.args else "Not found")
+
+
+def _solve_job(employees, stores, constraints, index=None):
+    if index is None:
+        index, employees = resolve(employees)
+    return solve(employees, stores, DAYS, SHIFTS, constraints, index=index)
+
+
+class ScheduleService:
+    """Request handlers plus the roster thread, the solver pool and the coalescing table."""
+
+    def __init__(self, workers=None, max_pending=MAX_PENDING, max_requests=MAX_REQUESTS, cache_dir=None):
+        self.roster_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="roster")
+        if workers == 0:
+            # Solve on one thread with the shared index instead of in worker processes
+            self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solver")
+        else:
+            self.pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        self.in_process = workers == 0
+        self.cache = ScheduleCache(cache_dir)
+        self.max_pending = max_pending
+        self.max_requests = max_requests
+        self.pending = {}  # Cache key -> task solving it
+        self.active = 0
+        self.counts = {"requests": 0, "busy": 0, "errors": 0, "solved": 0, "cache_hits": 0, "coalesced": 0}
+        self._employees_body = (None, b"")  # (Roster, encoded records) so repeated reads skip json.dumps
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+        self.roster_thread.shutdown()
+
+    async def on_roster(self, func, *args):
+        """Run func on the roster thread."""
+        return await asyncio.get_running_loop().run_in_executor(self.roster_thread, func, *args)
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until it closes or idles out."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), IDLE_TIMEOUT)
+                except HttpError as e:
+                    writer.write(encode_response(e.status, json_body({"error": str(e)}), "application/json",
+                                                 e.headers, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body, version = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                status, payload, content_type, extra = await self.dispatch(method, path, body)
+                writer.write(encode_response(status, payload, content_type, extra, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, body):
+        """Route one request; return (status, body bytes, content type, headers)."""
+        self.counts["requests"] += 1
+        if self.active >= self.max_requests:
+            self.counts["busy"] += 1
+            return 503, json_body({"error": "Service is busy; retry shortly"}), "application/json", {"Retry-After": "1"}
+        self.active += 1
+        try:
+            result = await self.route(method, [urllib.parse.unquote(part) for part in path.strip("/").split("/")],
+                                      parse_json(body))
+            if isinstance(result, tuple):
+                return (200, *result, {})
+            return 200, result if isinstance(result, bytes) else json_body(result), "application/json", {}
+        except HttpError as e:
+            if e.status == 503:
+                self.counts["busy"] += 1
+            return e.status, json_body({"error": str(e)}), "application/json", e.headers
+        except Exception as e:
+            self.counts["errors"] += 1
+            traceback.print_exc()
+            return 500, json_body({"error": f"{type(e).__name__}: {e}"}), "application/json", {}
+        finally:
+            self.active -= 1
+
+    async def route(self, method, parts, request):
+        """Return a JSON-able value, encoded bytes, or (bytes, content type)."""
+        resource = parts[0]
+        if resource == "health" and method == "GET":
+            return {"status": "ok", "pending_solves": len(self.pending), "active_requests": self.active,
+                    **self.counts}
+        if resource == "version" and method == "GET":
+            return await self.on_roster(lambda: {"version": get_roster().fingerprint})
+        if resource == "employees" and len(parts) == 1:
+            if method == "GET":
+                return await self.on_roster(self.employees_body)
+            if method in ("POST", "PUT"):
+                records = request if isinstance(request, list) else [request]
+                for record in records:
+                    check_record(record)
+                if method == "POST":
+                    await self.on_roster(write_call, add_employees, records)
+                    return {"added": len(records)}
+                await self.on_roster(write_call, replace_employees, records)
+                return {"replaced": len(records)}
+        if resource == "employees" and len(parts) == 2:
+            if method == "PUT":
+                check_record(request)
+                await self.on_roster(lambda: write_call(update_employee, self.find_employee(parts[1]), request))
+                return {"updated": request["name"]}
+            if method == "DELETE":
+                await self.on_roster(lambda: write_call(delete_employee, self.find_employee(parts[1])))
+                return {"deleted": parts[1]}
+        if resource == "selection":
+            if method == "GET":
+                return await self.on_roster(read_selection)
+            if method == "PUT":
+                if not isinstance(request, dict):
+                    raise HttpError(400, "The selection must be a {name: bool} object")
+                await self.on_roster(write_selection, request)
+                return {"selected": sum(1 for value in request.values() if value)}
+        if resource == "generate" and method == "POST":
+            schedule, key, source = await self.generate({} if request is None else request)
+            return {"key": key, "source": source, "schedule": schedule.to_state()}
+        if resource == "export" and method == "POST":
+            return await self.export({} if request is None else request)
+        if resource in ("health", "version", "employees", "selection", "generate", "export"):
+            raise HttpError(405, f"{method} is not supported on /{'/'.join(parts)}")
+        raise HttpError(404, f"No route for /{'/'.join(parts)}")
+
+    def employees_body(self):
+        """Roster thread: the encoded record list, re-encoded only after the roster changes."""
+        roster = get_roster()
+        if self._employees_body[0] is not roster:
+            self._employees_body = (roster, json_body({"employees": roster.employees}))
+        return self._employees_body[1]
+
+    def find_employee(self, name):
+        """Roster thread: the current record for name, or HttpError 404."""
+        record = get_roster().by_name.get(name)
+        if record is None:
+            raise HttpError(404, f"No employee named {name}")
+        return record
+
+    def prepare(self, request):
+        """Roster thread: return (key, job, cached schedule or None).
+
+        job is (employees, stores, constraints, index), with the roster's
+        index only when solving in this process.
+        """
+        constraints = constraints_from(request)
+        stores = request.get("stores") or list(STORES)
+        selected = request.get("selected")
+        for field, value in (("stores", stores), ("selected", selected or [])):
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise HttpError(400, f"'{field}' must be a list of names")
+        unknown = [store for store in stores if store not in STORES]
+        if unknown:
+            raise HttpError(400, f"Unknown store(s): {', '.join(unknown)}")
+        roster = get_roster()
+        if selected is None:
+            employees = list(roster.employees)
+        else:
+            selected = set(selected)
+            employees = [emp for emp in roster.employees if emp["name"] in selected]
+        key, constraints = cache_key(roster, employees, stores, DAYS, SHIFTS, constraints)
+        index = roster.index if self.in_process else None
+        return key, (employees, stores, constraints, index), self.cache.get(key)
+
+    async def generate(self, request):
+        """Return (schedule, key, source) where source is "cache", "coalesced" or "solved"."""
+        key, job, schedule = await self.on_roster(self.prepare, request)
+        if schedule is not None:
+            self.counts["cache_hits"] += 1
+            return schedule, key, "cache"
+        task = self.pending.get(key)
+        if task is not None:
+            self.counts["coalesced"] += 1
+            return (await asyncio.shield(task)).copy(), key, "coalesced"
+        if len(self.pending) >= self.max_pending:
+            raise HttpError(503, "Too many schedules are being generated; retry shortly", {"Retry-After": "1"})
+        task = asyncio.ensure_future(self.solve(key, job))
+        self.pending[key] = task
+        task.add_done_callback(lambda _: self.pending.pop(key, None))
+        return (await asyncio.shield(task)).copy(), key, "solved"
+
+    async def solve(self, key, job):
+        loop = asyncio.get_running_loop()
+        employees, stores, constraints, index = job
+        if index is None:
+            # Workers map a pinned roster snapshot, which outlives edits made meanwhile
+            employees = await self.on_roster(share, employees)
+        try:
+            schedule = await loop.run_in_executor(self.pool, _solve_job, employees, stores, constraints, index)
+        finally:
+            release(employees)
+        self.counts["solved"] += 1
+        await loop.run_in_executor(None, self.cache.put, key, schedule)
+        return schedule
+
+    async def export(self, request):
+        if not isinstance(request, dict):
+            raise HttpError(400, "An export request must be a JSON object")
+        fmt = request.get("format", "csv")
+        if fmt not in FORMATS:
+            raise HttpError(400, f"Unknown export format: {fmt}")
+        week_start = request.get("week_start")
+        try:
+            week_start = datetime.date.fromisoformat(week_start) if week_start else None
+        except (TypeError, ValueError):
+            raise HttpError(400, f"Invalid week_start: {week_start}")
+        schedule, _, _ = await self.generate(request)
+        body = await asyncio.get_running_loop().run_in_executor(None, export_bytes, schedule, fmt, week_start)
+        return body, EXPORT_TYPES[fmt]
+
+
+def export_bytes(schedule, fmt, week_start=None):
+    """Export one week to a temporary location and return the file (ics: a zip) as bytes."""
+    with tempfile.TemporaryDirectory() as directory:
+        target = os.path.join(directory, f"schedule.{fmt}")
+        export_schedule(schedule, fmt, target, week_start)
+        if fmt == "ics":
+            target = shutil.make_archive(os.path.join(directory, "calendars"), "zip", target)
+        with open(target, "rb") as file:
+            return file.read()
+
+
+def read_selection():
+    try:
+        with open(SELECTION_FILE, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def write_selection(state):
+    # Write to a temporary file and rename so readers never see half a file
+    tmp_path = SELECTION_FILE + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(state, file)
+    os.replace(tmp_path, SELECTION_FILE)
+
+
+async def serve(host, port, service):
+    server = await asyncio.start_server(service.handle_connection, host, port, backlog=1024)
+    # Load and index the roster before the first request needs it
+    start = time.perf_counter()
+    employees = await service.on_roster(lambda: len(get_roster().index))
+    print(f"Loaded {employees} employees in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    print(f"Serving on http://{host}:{port}", file=sys.stderr, flush=True)
+    # Stop on SIGTERM as on Ctrl+C, so the solver processes are shut down too
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signum, stop.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+    async with server:
+        await stop.wait()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="service.py", description="Local schedule service (JSON over HTTP).")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help="Port to listen on (default: %(default)s)")
+    parser.add_argument("--workers", type=int,
+                        help="Solver processes (default: one per CPU; 0 solves on a thread in this process)")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                        help="Different solves queued before new ones get 503 (default: %(default)s)")
+    parser.add_argument("--max-requests", type=int, default=MAX_REQUESTS,
+                        help="Requests handled at once before new ones get 503 (default: %(default)s)")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="Also keep generated schedules on disk in DIR (default: memory only)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if SERVICE_URL:
+        raise SystemExit("Unset SCHEDULE_GEN_SERVICE before starting the service itself.")
+    service = ScheduleService(args.workers, args.max_pending, args.max_requests, args.cache)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,148 @@
+# service_client.py
+#
+# Client for the schedule service (service.py). ServiceClient has the same
+# read and write methods as EmployeeStore, so roster.py uses it as the
+# employee source when SCHEDULE_GEN_SERVICE is set; it also generates and
+# exports schedules and reads the shared selection. Each thread keeps its
+# own keep-alive connection.
+
+import http.client
+import json
+import threading
+import urllib.parse
+from constants import SERVICE_URL
+from schedule_grid import Schedule
+
+
+class ServiceError(Exception):
+    """A request the service failed or could not be sent; status is 0 if unreachable."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ServiceBusy(ServiceError):
+    """The service refused the request under load; retry after retry_after seconds."""
+
+    def __init__(self, message, retry_after=1):
+        super().__init__(503, message)
+        self.retry_after = retry_after
+
+
+class ServiceClient:
+    """Employee store and schedule generator backed by a running service."""
+
+    def __init__(self, url=SERVICE_URL, timeout=120):
+        self.url = url
+        parts = urllib.parse.urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def request(self, method, path, payload=None, raw=False):
+        """Send one request; return the decoded JSON (or bytes with raw) or raise."""
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn = getattr(self._local, "conn", None)
+        reused = conn is not None
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.request(method, path, body, headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            self._local.conn = None
+            if reused:
+                # The service closed an idle keep-alive connection; send once more on a new one
+                return self.request(method, path, payload, raw)
+            raise ServiceError(0, f"Lost the connection to the schedule service at {self.url}")
+        except OSError as e:
+            conn.close()
+            self._local.conn = None
+            raise ServiceError(0, f"Schedule service unreachable at {self.url}: {e}")
+        if response.getheader("Connection", "").lower() == "close":
+            conn.close()
+            self._local.conn = None
+
+        if response.status == 200:
+            return data if raw else json.loads(data)
+        try:
+            message = json.loads(data)["error"]
+        except (ValueError, KeyError, TypeError):
+            message = data.decode("utf-8", "replace") or response.reason
+        if response.status == 400:
+            raise ValueError(message)
+        if response.status == 404:
+            raise KeyError(message)
+        if response.status == 503:
+            raise ServiceBusy(message, int(response.getheader("Retry-After", "1")))
+        raise ServiceError(response.status, message)
+
+    def health(self):
+        return self.request("GET", "/health")
+
+    # EmployeeStore interface
+
+    def data_version(self):
+        """Return the roster fingerprint, which changes whenever any client edits it."""
+        return self.request("GET", "/version")["version"]
+
+    def iter_all(self):
+        return iter(self.all())
+
+    def all(self):
+        return self.request("GET", "/employees")["employees"]
+
+    def add(self, record):
+        self.request("POST", "/employees", record)
+
+    def add_many(self, records):
+        self.request("POST", "/employees", list(records))
+
+    def update(self, name, record):
+        self.request("PUT", "/employees/" + urllib.parse.quote(name, safe=""), record)
+
+    def delete(self, name):
+        self.request("DELETE", "/employees/" + urllib.parse.quote(name, safe=""))
+
+    def replace_all(self, records):
+        self.request("PUT", "/employees", list(records))
+
+    # Selection and schedules
+
+    def get_selection(self):
+        return self.request("GET", "/selection")
+
+    def put_selection(self, state):
+        self.request("PUT", "/selection", state)
+
+    def generate(self, selected, stores, constraints):
+        """Solve on the service; return (Schedule, source) with source "solved", "coalesced" or "cache"."""
+        response = self.request("POST", "/generate", generate_request(selected, stores, constraints))
+        return Schedule.from_state(response["schedule"]), response["source"]
+
+    def export(self, selected, stores, constraints, fmt, week_start=None):
+        """Return the exported file as bytes (a zip of calendars for "ics")."""
+        request = generate_request(selected, stores, constraints)
+        request["format"] = fmt
+        if week_start is not None:
+            request["week_start"] = week_start.isoformat()
+        return self.request("POST", "/export", request, raw=True)
+
+
+def generate_request(selected, stores, constraints):
+    """Return the JSON body of a generate request; selected=None means everyone."""
+    return {
+        "selected": None if selected is None else list(selected),
+        "stores": list(stores),
+        "mode": constraints.mode,
+        "seed": constraints.seed,
+        "slot_size": constraints.slot_size,
+        "max_shifts": constraints.max_shifts,
+        "time_budget": constraints.time_budget,
+        "headcount": constraints.headcount,
+    }
\ No newline at end of file
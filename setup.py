@@ -5,6 +5,8 @@ DATA_FILES = ['employee.json']  # Add any other files you want to include (e.g.,
 OPTIONS = {
     'argv_emulation': True,
     'packages': ['customtkinter', 'tkinter'],  # Add any other required packages
+    # main.py imports the dialogs on first click; list them so the bundle always has them
+    'includes': ['employee_form', 'employee_list', 'employee_selection', 'schedule_generator', 'roster_import'],
     'plist': {
         'CFBundleName': 'EmployeeScheduler',
         'CFBundleShortVersionString': '1.0',
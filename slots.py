@@ -0,0 +1,77 @@
+# slots.py
+#
+# Precomputed slot table shared by the solver, scoring, repair, rendering and
+# the employee form. Every (day, shift, store) slot gets an integer cell id
+# (the same numbering Schedule uses), a headcount target, and the canonical
+# "AM SUN"-style hour key of its (day, shift), so hot loops index lists
+# instead of formatting strings.
+
+import functools
+from array import array
+from availability import hour_key
+from constants import STORES, DAYS, SHIFTS, SLOT_SIZE, HEADCOUNT
+
+
+def headcount_for(headcount, day, shift, store, default):
+    """Return the target for a slot from "STORE/DAY/SHIFT" rules ("*" = any).
+
+    The rule naming the most fields wins; among equally specific rules the
+    last one listed wins.
+    """
+    best, best_specificity = default, -1
+    for pattern, count in headcount.items():
+        parts = pattern.split("/")
+        if len(parts) != 3:
+            raise ValueError(f"Headcount rule {pattern!r} must look like STORE/DAY/SHIFT")
+        if all(part in ("*", value) for part, value in zip(parts, (store, day, shift))):
+            specificity = sum(part != "*" for part in parts)
+            if specificity >= best_specificity:
+                best, best_specificity = count, specificity
+    return best
+
+
+class SlotTable:
+    """Integer ids, hour keys and headcount targets for every slot of a week."""
+
+    def __init__(self, stores, days, shifts, default_size=SLOT_SIZE, headcount=None):
+        self.stores = list(stores)
+        self.days = list(days)
+        self.shifts = list(shifts)
+        self.day_codes = [day[:3].upper() for day in self.days]  # "SUN", "MON", ...
+        # hour_keys[day id][shift id] -> "AM SUN"
+        self.hour_keys = [[hour_key(day, shift) for shift in self.shifts] for day in self.days]
+        # hour_slots["AM SUN"] -> (day id, shift id)
+        self.hour_slots = {
+            key: (day_id, shift_id)
+            for day_id, keys in enumerate(self.hour_keys) for shift_id, key in enumerate(keys)
+        }
+        headcount = headcount or {}
+        # Cell ids run day-major, then shift, then store, matching Schedule
+        self.targets = array("B", [
+            headcount_for(headcount, day, shift, store, default_size)
+            for day in self.days for shift in self.shifts for store in self.stores
+        ])
+        self.capacity = max(self.targets, default=0)  # Positions the Schedule must hold per cell
+        self.demand = sum(self.targets)               # Positions wanted in the whole week
+
+    def cell(self, day_id, shift_id, store_id):
+        return (day_id * len(self.shifts) + shift_id) * len(self.stores) + store_id
+
+    def target(self, day, shift, store):
+        """Return the headcount target of a slot given by name."""
+        return self.targets[self.cell(self.days.index(day), self.shifts.index(shift), self.stores.index(store))]
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_table(stores, days, shifts, default_size, headcount):
+    return SlotTable(stores, days, shifts, default_size, dict(headcount))
+
+
+def slot_table(stores, days, shifts, constraints=None):
+    """Return the shared SlotTable for these lists and the constraints' headcount settings."""
+    default_size = SLOT_SIZE if constraints is None else constraints.slot_size
+    headcount = HEADCOUNT if constraints is None else constraints.headcount
+    return _cached_table(tuple(stores), tuple(days), tuple(shifts), default_size, tuple(headcount.items()))
+
+
+SLOT_TABLE = slot_table(STORES, DAYS, SHIFTS)  # The configured catalog
\ No newline at end of file
@@ -0,0 +1,125 @@
+# solver.py
+#
+# Headless scheduling engine. Nothing in here may import tkinter or
+# customtkinter: the GUI, batch jobs and services all call into this module.
+
+import copy
+import random
+from availability import AvailabilityIndex, iter_bits
+from constants import HEADCOUNT, MAX_SHIFTS, SLOT_SIZE
+from flow_solver import solve_min_cost_flow
+from profiling import phase, profiled
+from schedule_grid import Schedule
+from scoring import evaluate
+from slots import slot_table
+
+MODES = ("random", "optimal")
+
+
+class SolveCancelled(Exception):
+    """Raised when a solve is stopped through its cancel event."""
+
+
+class Constraints:
+    """Limits and options that control a single solve."""
+
+    def __init__(self, slot_size=SLOT_SIZE, max_shifts=MAX_SHIFTS, seed=None, mode="random", time_budget=None,
+                 headcount=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown solve mode: {mode}")
+        self.slot_size = slot_size      # Default employees wanted per (day, shift, store)
+        self.max_shifts = max_shifts    # Default shifts per employee per week (records may set "max_shifts")
+        self.seed = seed                # Seed for the solver RNG (None = pick one at random)
+        self.mode = mode                # "random" sampler or "optimal" min-cost flow
+        self.time_budget = time_budget  # Seconds the optimal mode may spend (None = no limit)
+        # Per-slot targets, "STORE/DAY/SHIFT" -> employees (see slots.headcount_for)
+        self.headcount = dict(HEADCOUNT if headcount is None else headcount)
+
+    def with_seed(self, seed):
+        """Return a copy of these constraints using another seed."""
+        other = copy.copy(self)
+        other.seed = seed
+        return other
+
+
+@profiled("solve")
+def solve(employees, stores, days, shifts, constraints=None, index=None, progress=None, cancel=None):
+    """Assign employees to every (day, shift, store) slot and return a Schedule.
+
+    ``index`` may be an AvailabilityIndex built for a larger roster (e.g. the
+    whole employee file) so it can be reused across selections; only the
+    records in ``employees`` are scheduled.
+
+    The "random" mode samples each slot in turn and is the fast baseline. The
+    "optimal" mode fills every slot to its headcount target whenever the
+    roster allows it, balances shifts across employees and is deterministic
+    for a given seed.
+
+    ``progress(filled, total)`` is called as positions are filled, from the
+    solving thread. ``cancel`` is any object with ``is_set()`` (such as a
+    threading.Event); once it is set the solve stops and raises SolveCancelled.
+    """
+    if constraints is None:
+        constraints = Constraints()
+    if constraints.seed is None:
+        # Draw a seed anyway so the schedule can be regenerated exactly
+        constraints = constraints.with_seed(random.randrange(2 ** 32))
+    rng = random.Random(constraints.seed)
+
+    if index is None:
+        index = AvailabilityIndex(employees)
+        open_mask = index.all_mask
+    else:
+        with phase("filter_selection"):
+            open_mask = index.mask_for(employees)
+
+    table = slot_table(stores, days, shifts, constraints)
+    schedule = Schedule(days, shifts, stores, table.capacity)
+    schedule.seed = constraints.seed
+    if constraints.mode == "optimal":
+        with phase("min_cost_flow"):
+            cells = solve_min_cost_flow(index, open_mask, table, constraints, rng, progress, cancel)
+        if cancel is not None and cancel.is_set():
+            raise SolveCancelled()
+        for (day, shift, store), selected in cells.items():
+            schedule.assign(day, shift, store, [index.employees[i]["name"] for i in selected])
+    else:
+        with phase("sample_slots"):
+            _sample_slots(schedule, table, index, open_mask, constraints, rng, progress, cancel)
+
+    with phase("evaluate"):
+        schedule.stats = evaluate(schedule, index.members(open_mask), constraints, index.collab)
+    return schedule
+
+
+def _sample_slots(schedule, table, index, open_mask, constraints, rng, progress=None, cancel=None):
+    """Fill each slot in turn with a random sample of the remaining candidates."""
+    employee_shifts = [0] * len(index)  # Track shifts per roster position
+    caps = index.shift_caps(constraints.max_shifts)
+    store_masks = [index.store_masks.get(store, 0) for store in table.stores]
+    targets = table.targets
+    total = table.demand
+    filled = 0
+    cell = 0
+
+    for day, hour_keys in zip(table.days, table.hour_keys):
+        for shift, key in zip(table.shifts, hour_keys):
+            if cancel is not None and cancel.is_set():
+                raise SolveCancelled()
+            hour_mask = index.hour_masks.get(key, 0) & open_mask
+            if not hour_mask:
+                cell += len(store_masks)
+                continue
+            for store, store_mask in zip(table.stores, store_masks):
+                # open_mask only holds employees still under their shift limit
+                available = list(iter_bits(store_mask & hour_mask & open_mask))
+                selected = rng.sample(available, min(targets[cell], len(available)))
+                cell += 1
+                schedule.assign(day, shift, store, [index.employees[i]["name"] for i in selected])
+                for i in selected:
+                    employee_shifts[i] += 1
+                    if employee_shifts[i] >= caps[i]:
+                        open_mask &= ~(1 << i)
+                filled += len(selected)
+            if progress is not None:
+                progress(filled, total)
\ No newline at end of file
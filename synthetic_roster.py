@@ -0,0 +1,75 @@
+# synthetic_roster.py
+#
+# Generates employee.json-format rosters (one JSON record per line) of any
+# size for benchmarks and load tests:
+#
+#   python synthetic_roster.py --employees 10000 --stores 8 --density 0.3 --out employee.json
+
+import argparse
+import json
+import random
+import sys
+from constants import STORES, DAYS, SHIFTS
+
+COLLAB_RATE = 0.2  # Share of employees with a preferred collaborator
+
+
+def store_names(count):
+    """Return count store names: the real STORES first, then "STORE 6", "STORE 7", ..."""
+    return list(STORES[:count]) + [f"STORE {i}" for i in range(len(STORES) + 1, count + 1)]
+
+
+def synthetic_employees(count, stores=None, density=0.4, seed=0):
+    """Yield count employee records.
+
+    Each record works each store and each hour with probability ``density``
+    (at least one of each), and some name an earlier employee as collaborator.
+    The same arguments always yield the same records.
+    """
+    rng = random.Random(seed)
+    stores = list(STORES) if stores is None else list(stores)
+    hours = [f"{shift} {day[:3].upper()}" for day in DAYS for shift in SHIFTS]
+    for i in range(count):
+        name = f"Employee {_letters(i)}"
+        collab = "No Collab"
+        if i and rng.random() < COLLAB_RATE:
+            collab = f"Employee {_letters(rng.randrange(i))}"
+        yield {
+            "name": name,
+            "stores": [store for store in stores if rng.random() < density] or [rng.choice(stores)],
+            "hours": [hour for hour in hours if rng.random() < density] or [rng.choice(hours)],
+            "collab": collab,
+        }
+
+
+def _letters(i):
+    """Spreadsheet-style letters for i (0 -> A, 26 -> AA), since names must be alphabetic."""
+    letters = ""
+    i += 1
+    while i:
+        i, rest = divmod(i - 1, 26)
+        letters = chr(ord("A") + rest) + letters
+    return letters
+
+
+def write_roster(path, count, stores=None, density=0.4, seed=0):
+    """Write a synthetic roster to path in the employee.json format."""
+    with open(path, "w") as file:
+        for record in synthetic_employees(count, stores, density, seed):
+            file.write(json.dumps(record) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic employee roster.")
+    parser.add_argument("--employees", type=int, default=1000, help="Number of employees (default: %(default)s)")
+    parser.add_argument("--stores", type=int, default=len(STORES), help="Number of stores (default: %(default)s)")
+    parser.add_argument("--density", type=float, default=0.4,
+                        help="Chance an employee works a given store or hour (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: %(default)s)")
+    parser.add_argument("--out", default="employee.json", help="Output file (default: %(default)s)")
+    args = parser.parse_args(argv)
+    write_roster(args.out, args.employees, store_names(args.stores), args.density, args.seed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,87 @@
+# test_employee_log.py
+#
+# Crash and replay tests for the snapshot + log employee file. A crash in
+# the middle of a compaction is simulated by putting the old log back after
+# the new snapshot has been swapped in.
+#
+#   python -m unittest test_employee_log
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from employee_log import EmployeeLog, iter_records, log_path_for
+
+
+def employee(name, stores=("LEHI",)):
+    return {"name": name, "stores": list(stores), "hours": ["AM SUN"], "collab": "No Collab"}
+
+
+class EmployeeLogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "employee.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def names(self):
+        """Names as seen by a fresh writer and by a reader; both must agree."""
+        loaded = [record["name"] for record in EmployeeLog(self.path).load()]
+        self.assertEqual(loaded, [record["name"] for record in iter_records(self.path)])
+        return loaded
+
+    def crash_before_log_cleared(self, log, action):
+        """Run action, then restore the log as it was, as if the process died before clearing it."""
+        with open(log_path_for(self.path), "rb") as file:
+            old_log = file.read()
+        action(log)
+        with open(log_path_for(self.path), "wb") as file:
+            file.write(old_log)
+
+    def test_replace_all_crash_does_not_revive_deleted_employees(self):
+        log = EmployeeLog(self.path)
+        log.add(employee("Cat"))
+        dan = log.add(employee("Dan"))
+        log.update(dan, employee("Dan", ["SANDY"]))
+        self.crash_before_log_cleared(log, lambda log: log.replace_all([employee("Dan", ["MURRAY"])]))
+        self.assertEqual(self.names(), ["Dan"])
+        self.assertEqual([record["stores"] for record in iter_records(self.path)], [["MURRAY"]])
+
+    def test_writes_after_compact_crash_are_kept(self):
+        log = EmployeeLog(self.path)
+        ann = log.add(employee("Ann"))
+        log.update(ann, employee("Ann", ["SANDY"]))
+        self.crash_before_log_cleared(log, lambda log: log.compact())
+        log = EmployeeLog(self.path)
+        log.update(ann, employee("Ann", ["MURRAY"]))
+        log.add(employee("Bo"))
+        self.assertEqual(self.names(), ["Ann", "Bo"])
+        self.assertEqual([record["stores"] for record in EmployeeLog(self.path).load()], [["MURRAY"], ["LEHI"]])
+        EmployeeLog(self.path).compact()
+        self.assertEqual(self.names(), ["Ann", "Bo"])
+
+    def test_deleted_ids_are_not_reused_after_compaction(self):
+        log = EmployeeLog(self.path)
+        log.add(employee("Ann"))
+        bo = log.add(employee("Bo"))
+        log.delete(bo)
+        log.compact()
+        self.assertGreater(EmployeeLog(self.path).add(employee("Cy")), bo)
+
+    def test_old_files_without_sequence_numbers_replay(self):
+        with open(self.path, "w") as file:
+            file.write(json.dumps(employee("Ann")) + "\n" + json.dumps(employee("Bo")) + "\n")
+        with open(log_path_for(self.path), "w") as file:
+            file.write(json.dumps({"op": "delete", "id": 1}) + "\n")
+            file.write(json.dumps({"op": "add", "id": 3, "record": dict(employee("Cy"), id=3)}) + "\n")
+        self.assertEqual(self.names(), ["Bo", "Cy"])
+        log = EmployeeLog(self.path)
+        self.crash_before_log_cleared(log, lambda log: log.compact())
+        self.assertEqual(self.names(), ["Bo", "Cy"])
+        self.assertEqual(EmployeeLog(self.path).add(employee("Di")), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -1,38 +1,28 @@
 import json
 from tkinter import messagebox
+from roster import get_roster, normalize_name, replace_employees
+from roster import validate_name  # Re-exported; lives in roster so headless code can use it
 
 def read_employees():
-    """Read employees from the JSON file."""
+    """Read employees from the JSON file (or the SQLite store if configured).
+
+    Records come from the shared roster cache and must not be modified in place.
+    """
     try:
-        with open("employee.json", "r") as file:
-            return [json.loads(line) for line in file]
-    except FileNotFoundError:
-        return []
+        return list(get_roster().employees)
     except Exception as e:
         messagebox.showerror("Error", f"Failed to read employees: {e}")
         return []
 
 def write_employees(employees):
-    """Write employees to the JSON file."""
+    """Write employees to the JSON file (or the SQLite store if configured)."""
     try:
-        with open("employee.json", "w") as file:
-            for emp in employees:
-                file.write(json.dumps(emp) + "\n")
+        # Accept records or their JSON text, without encoding the text a second time
+        records = [json.loads(emp) if isinstance(emp, str) else emp for emp in employees]
+        replace_employees(records)
     except Exception as e:
         messagebox.showerror("Error", f"Failed to write employees: {e}")
 
 def is_duplicate_name(name):
     """Check if an employee name already exists (case-insensitive)."""
-    employees = read_employees()
-    for emp in employees:
-        if emp["name"].strip().lower() == name.strip().lower():
-            return True
-    return False
-
-def validate_name(name):
-    """Validate the employee name."""
-    if not name:
-        return "Name is required!"
-    if not name.replace(" ", "").isalpha():
-        return "Name should only contain alphabets and spaces."
-    return None
\ No newline at end of file
+    return normalize_name(name) in get_roster().name_keys
\ No newline at end of file
@@ -0,0 +1,100 @@
+# virtual_list.py
+
+import customtkinter as ctk
+import tkinter as tk
+from itertools import islice
+
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list that only creates widgets for the visible rows.
+
+    ``create_row(parent)`` builds one row widget and ``update_row(widget, item)``
+    points an existing row at a new item. Rows are recycled as the list scrolls,
+    so the widget count depends on the viewport height, not on len(items).
+    """
+
+    def __init__(self, master, create_row, update_row, row_height=32, overscan=4, **kwargs):
+        super().__init__(master, **kwargs)
+        self.create_row = create_row
+        self.update_row = update_row
+        self.row_height = row_height
+        self.overscan = overscan  # Extra rows kept above and below the viewport
+        self.items = []
+        self.rows = []  # [widget, canvas window id, index of the bound item]
+
+        self.canvas = tk.Canvas(self, highlightthickness=0)
+        self.scrollbar = ctk.CTkScrollbar(self, orientation="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+
+    def extend(self, items):
+        """Append items to the list."""
+        self.items.extend(items)
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.items) * self.row_height))
+        self.refresh()
+
+    def on_scroll(self, first, last):
+        """Keep the scrollbar in sync and rebind rows that scrolled into view."""
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def refresh(self):
+        """Position the pooled rows over the visible slice of items."""
+        visible = self.canvas.winfo_height() // self.row_height + 1
+        wanted = min(visible + 2 * self.overscan, len(self.items))
+        while len(self.rows) < wanted:
+            widget = self.create_row(self.canvas)
+            window = self.canvas.create_window(0, 0, window=widget, anchor="nw")
+            self.rows.append([widget, window, None])
+
+        first = max(0, int(self.canvas.canvasy(0)) // self.row_height - self.overscan)
+        for offset, row in enumerate(self.rows):
+            widget, window, bound = row
+            i = first + offset
+            if i >= len(self.items):
+                self.canvas.itemconfigure(window, state="hidden")
+                row[2] = None
+            elif i != bound:
+                self.canvas.coords(window, 0, i * self.row_height)
+                self.canvas.itemconfigure(window, state="normal")
+                self.update_row(widget, self.items[i])
+                row[2] = i
+
+    def rebind(self):
+        """Re-run update_row on every visible row, e.g. after the items changed state."""
+        for row in self.rows:
+            row[2] = None
+        self.refresh()
+
+
+class ChunkedLoader:
+    """Feed items from an iterator to a callback in chunks between Tk events."""
+
+    def __init__(self, widget, iterable, consume, chunk_size=500):
+        self.widget = widget
+        self.iterator = iter(iterable)
+        self.consume = consume
+        self.chunk_size = chunk_size
+        self.done = False
+        self.widget.after_idle(self.step)
+
+    def step(self):
+        """Load one chunk and schedule the next."""
+        if self.done or not self.widget.winfo_exists():
+            return
+        chunk = list(islice(self.iterator, self.chunk_size))
+        if chunk:
+            self.consume(chunk)
+            self.widget.after(1, self.step)
+        else:
+            self.done = True
+
+    def drain(self):
+        """Load everything that is left right now."""
+        if not self.done:
+            rest = list(self.iterator)
+            if rest:
+                self.consume(rest)
+            self.done = True
\ No newline at end of file